@@ -1,16 +1,191 @@
+import atexit
 import cmd
-import sys
+import itertools
+import os
 import re
-import sqlite3
-from typing import Optional
-from database import DatabaseManager
-from conversation_tree import ConversationTree
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, List, Optional
 import utils
+from conversation_tree import SubjectGenerationError
+
+if TYPE_CHECKING:
+    from database import Conversation, DatabaseManager
+    from conversation_tree import ConversationTree
+
+# Matches "ask @<id> <prompt>" to extract an explicit parent ID
+_ASK_PARENT_RE = re.compile(r'^@(\d+)\s+(.+)', re.DOTALL)
+
+# Leading whitespace plus one edit argument (any run of double-quoted, single-quoted
+# or unquoted pieces), or the end of the line
+_EDIT_TOKEN_RE = re.compile(r'''[ \t\r\n]*(?:((?:"(?:\\.|[^"\\])*"|'[^']*'|(?:\\.|[^ \t\r\n"'\\])+)+)|\Z)''', re.DOTALL)
+
+# The quoted/unquoted pieces inside a single edit argument
+_EDIT_PIECE_RE = re.compile(r'''"((?:\\.|[^"\\])*)"|'([^']*)'|\\(.)|([^"'\\]+)''', re.DOTALL)
+
+# Backslash escapes that are honoured inside double quotes (as in shlex)
+_DOUBLE_QUOTE_ESCAPE_RE = re.compile(r'\\(["\\])')
+
+# An unfinished edit argument whose last character is a backslash that escapes nothing,
+# either outside quotes or inside an unclosed double quote
+_EDIT_TRAILING_ESCAPE_RE = re.compile(r'''(?:"(?:\\.|[^"\\])*"|'[^']*'|\\.|[^"'\\])*(?:"(?:\\.|[^"\\])*)?\\''', re.DOTALL)
+
+
+def _unquote_edit_piece(match) -> str:
+    """Return the literal text of one piece matched by _EDIT_PIECE_RE."""
+    double_quoted, single_quoted, escaped, plain = match.groups()
+    if double_quoted is not None:
+        return _DOUBLE_QUOTE_ESCAPE_RE.sub(r'\1', double_quoted)
+    if single_quoted is not None:
+        return single_quoted
+    if escaped is not None:
+        return escaped
+    return plain
+
+
+def _split_edit_args(arg: str) -> List[str]:
+    """Split edit command arguments on whitespace, honouring quotes and backslash escapes.
+    
+    Produces the same tokens as shlex.split for the edit grammar without building a
+    shlex lexer and scanning the line one character at a time in Python.
+    
+    Args:
+        arg: Argument string passed to the edit command
+        
+    Returns:
+        List of tokens with quotes removed
+        
+    Raises:
+        ValueError: If a quote is not closed or the line ends with a lone backslash
+    """
+    tokens = []
+    pos = 0
+    while True:
+        match = _EDIT_TOKEN_RE.match(arg, pos)
+        if match is None:
+            # shlex reports the state it is in when the line runs out
+            if _EDIT_TRAILING_ESCAPE_RE.fullmatch(arg, pos):
+                raise ValueError("No escaped character")
+            raise ValueError("No closing quotation")
+        
+        token = match.group(1)
+        if token is None:
+            return tokens
+        
+        if '"' in token or "'" in token or '\\' in token:
+            token = ''.join(_unquote_edit_piece(piece) for piece in _EDIT_PIECE_RE.finditer(token))
+        tokens.append(token)
+        pos = match.end()
+
+
+def _unique_missing(ids: List[int], existing_ids: set) -> List[int]:
+    """Return the IDs not in existing_ids, in first-seen order and without repeats."""
+    return [conv_id for conv_id in dict.fromkeys(ids) if conv_id not in existing_ids]
+
+
+def _format_missing_ids(singular: str, plural: str, missing_ids: List[int]) -> str:
+    """Build the single error message reporting one or more missing conversation IDs."""
+    if len(missing_ids) == 1:
+        return f"{singular} with ID {missing_ids[0]} not found."
+    return f"{plural} with IDs {', '.join(map(str, missing_ids))} not found."
+
+
+def _read_umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import, before any other thread could create a file while it is changed
+_UMASK = _read_umask()
+
+
+def _parse_id_list(value: str, label: str) -> List[int]:
+    """Parse a comma-separated list of conversation IDs for an edit option."""
+    try:
+        return [int(id_str.strip()) for id_str in value.split(',')]
+    except ValueError:
+        raise ValueError(f"Invalid {label} IDs: {value}. Use comma-separated numeric IDs.")
+
+
+def _parse_edit_parent(value: str) -> Optional[int]:
+    """Parse the value of the edit -parent option (None/null makes the conversation a root)."""
+    if value.lower() in ['none', 'null']:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid parent ID: {value}")
+
+
+def _parse_edit_link(value: str) -> List[int]:
+    """Parse the value of the edit -link option (None/null removes all links)."""
+    if value.lower() in ['none', 'null']:
+        return []  # Empty list means remove all links
+    return _parse_id_list(value, "link")
+
+
+def _parse_edit_unlink(value: str) -> List[int]:
+    """Parse the value of the edit -unlink option."""
+    return _parse_id_list(value, "unlink")
+
+
+# Maps each edit option flag to the key it is stored under and the parser for its value
+_EDIT_OPTIONS = {
+    '-subject': ('subject', str),
+    '-parent': ('parent', _parse_edit_parent),
+    '-link': ('link', _parse_edit_link),
+    '-unlink': ('unlink', _parse_edit_unlink),
+}
+
+# Tree drawing pieces: connectors in front of a node, and the prefix extension
+# for its children depending on whether the node was the last of its siblings
+_CONNECTOR_LAST = "└─ "
+_CONNECTOR_MORE = "├─ "
+_BRANCH_LAST = "    "
+_BRANCH_MORE = "│   "
+
+# Buffered streamed response text is written out once it reaches this many characters
+_STREAM_FLUSH_CHARS = 256
+
+# Seconds buffered streamed text may wait for a newline before it is written anyway,
+# so a slow model's long paragraph still appears as it is generated
+_STREAM_FLUSH_INTERVAL = 0.03
+
+# Flags that make rm delete without asking for confirmation
+_RM_YES_FLAGS = ('-y', '--yes')
+
+# General help shown by the help command, written out in one call
+_HELP_TEXT = (
+    "\nPromptree CLI - Help\n"
+    + "=" * 50 + "\n"
+    "Available commands:\n"
+    "  quit          - Quit the application\n"
+    "  rm [-y] <id>[,<id>,...] - Remove conversations and their subtrees (-y skips confirmation)\n"
+    "  edit <id> - Open conversation in external editor (plain text format) for comprehensive editing\n"
+    "  edit <id> [-subject \"<new subject>\"] [-parent <id|None>] [-link <id>[,<id>,...]] [-unlink <id>[,<id>,...]] - Modify conversation\n"
+    "  list         - List top-level conversations\n"
+    "  open <id>    - Show conversation and its subtree\n"
+    "  close        - Close current conversation context, reset to root\n"
+    "  search <text> - Search for text in conversations (* wildcards, case-insensitive)\n"
+    "  ask [@<id>] <prompt> - Ask a question with optional parent\n"
+    "  ask - Open external editor to input a longer prompt and parent ID from a file\n"
+    "  add - Open external editor to manually add a conversation with parent, links, prompt and response\n"
+    "  export <id> <file> - Export conversation tree to markdown\n"
+    "  summarize <id> - Summarize a conversation\n"
+    "  help         - Show this help message\n"
+    "\nFor help with a specific command, type: help <command>\n"
+    "\n"
+)
 
 class CLIHandler(cmd.Cmd):
     """Command-line interface handler for the Promptree application."""
     
-    def __init__(self, db_manager: DatabaseManager, conversation_tree: ConversationTree, model_name: str):
+    def __init__(self, db_manager: 'DatabaseManager', conversation_tree: 'ConversationTree', model_name: str):
         """
         Initialize the CLI handler.
         
@@ -25,6 +200,10 @@ class CLIHandler(cmd.Cmd):
         self.model_name = model_name
         self.intro = f"Welcome to Promptree CLI! Using model: {model_name}"
         self.current_parent_id: Optional[int] = None  # Current conversation context
+        self._stream_buf: List[str] = []  # Streamed response parts not yet written
+        self._stream_buf_len = 0
+        self._stream_last_flush = time.monotonic()
+        self._edit_file_path: Optional[str] = None  # Temporary file reused by every editor session
     
     def get_prompt(self) -> str:
         """Get the current command prompt string."""
@@ -48,7 +227,13 @@ class CLIHandler(cmd.Cmd):
         return self.do_quit(arg)
     
     def do_rm(self, arg):
-        """Remove conversations and their subtrees: rm <id>[,<id>,...]"""
+        """Remove conversations and their subtrees: rm [-y|--yes] <id>[,<id>,...]"""
+        # -y / --yes skips the confirmation prompt
+        tokens = arg.split()
+        skip_confirm = any(token in _RM_YES_FLAGS for token in tokens)
+        if skip_confirm:
+            arg = " ".join(token for token in tokens if token not in _RM_YES_FLAGS)
+        
         if not arg:
             print(utils.format_error("Please provide at least one conversation ID to remove."))
             return
@@ -60,24 +245,44 @@ class CLIHandler(cmd.Cmd):
             print(utils.format_error("Invalid ID format. Please provide numeric IDs separated by commas."))
             return
         
+        # Check which conversations exist with a single query
+        existing_ids = self.db_manager.exists_many(ids)
+        for conv_id in ids:
+            if conv_id not in existing_ids:
+                print(utils.format_error(f"Conversation with ID {conv_id} not found."))
+        
+        ids = [conv_id for conv_id in ids if conv_id in existing_ids]
+        if not ids:
+            return
+        
         # Confirm deletion
         print(f"You are about to delete conversations with IDs: {ids}")
         print("This will also delete all their descendant conversations.")
-        confirm = input("Are you sure? (yes/no): ").lower()
+        if skip_confirm:
+            confirm = 'yes'
+        else:
+            try:
+                confirm = input("Are you sure? (yes/no): ").lower()
+            except EOFError:
+                # Piped input ran out before an answer was given; treat it as a no
+                print()
+                confirm = 'no'
         
         if confirm in ['yes', 'y']:
+            try:
+                deleted_count = self.db_manager.delete_conversations_bulk(ids)
+            except Exception as e:
+                print(utils.format_error(f"Error deleting conversations {ids}: {e}"))
+                return
+            
             for conv_id in ids:
-                try:
-                    self.db_manager.delete_conversation(conv_id)
-                    print(f"Deleted conversation {conv_id} and its subtree.")
-                    
-                    # If the deleted conversation was the current parent context, reset it to None
-                    if self.current_parent_id == conv_id:
-                        self.current_parent_id = None
-                        print(f"Current parent context reset to None as conversation {conv_id} was deleted.")
-                        
-                except Exception as e:
-                    print(utils.format_error(f"Error deleting conversation {conv_id}: {e}"))
+                print(f"Deleted conversation {conv_id} and its subtree.")
+            print(f"Deleted {deleted_count} conversation(s) in total.")
+            
+            # If the deleted conversation was the current parent context, reset it to None
+            if self.current_parent_id in ids:
+                print(f"Current parent context reset to None as conversation {self.current_parent_id} was deleted.")
+                self.current_parent_id = None
         else:
             print("Deletion canceled.")
     
@@ -97,19 +302,13 @@ class CLIHandler(cmd.Cmd):
         edit <id> -subject \"<new subject>\" -unlink <id>[,<id>,...]
         edit <id> -parent <id|None> -unlink <id>[,<id>,...]
         edit <id> -subject \"<new subject>\" -parent <id|None> -unlink <id>[,<id>,...]"""
-        import tempfile
-        import subprocess
-        import os
-        
         if not arg:
             print(utils.format_error("Please provide a conversation ID and parameter(s) to edit."))
             return
         
-        # Parse the command using a more flexible approach
         # Split by spaces but preserve quoted strings
-        import shlex
         try:
-            tokens = shlex.split(arg)
+            tokens = _split_edit_args(arg)
         except ValueError as e:
             print(utils.format_error(f"Invalid syntax. Error parsing arguments: {e}"))
             print(utils.format_error("Use: edit <id> [-subject \"<new subject>\"] [-parent <id|None>] [-link <id>[,<id>,...]] [-unlink <id>[,<id>,...]]"))
@@ -137,77 +336,56 @@ class CLIHandler(cmd.Cmd):
             print(utils.format_error("Invalid syntax. Use: edit <id> [-subject \"<new subject>\"] [-parent <id|None>] [-link <id>[,<id>,...]] [-unlink <id>[,<id>,...]]"))
             return
         
-        # Parse the options using sentinel values to distinguish "not provided" from "provided as None"
-        NO_VALUE_PROVIDED = object()  # Sentinel object to differentiate
-        new_subject = NO_VALUE_PROVIDED
-        new_parent_id = NO_VALUE_PROVIDED
-        new_links = NO_VALUE_PROVIDED
-        unlink_ids = NO_VALUE_PROVIDED
+        # Parse the options through the dispatch table
+        options = {}
         i = 1
         while i < len(tokens):
-            if tokens[i] == '-subject' and i + 1 < len(tokens):
-                new_subject = tokens[i + 1]
-                i += 2
-            elif tokens[i] == '-parent' and i + 1 < len(tokens):
-                parent_arg = tokens[i + 1]
-                if parent_arg.lower() in ['none', 'null']:
-                    new_parent_id = None  # Actual None value
-                else:
-                    try:
-                        new_parent_id = int(parent_arg)
-                        # Validate that the new parent ID exists
-                        parent_conversation = self.db_manager.get_conversation(new_parent_id)
-                        if not parent_conversation:
-                            print(utils.format_error(f"Parent conversation with ID {new_parent_id} not found."))
-                            return
-                        
-                        # Check for circular reference (cannot set a child as parent)
-                        if self._would_create_circular_reference(conv_id, new_parent_id):
-                            print(utils.format_error(f"Cannot set parent to {new_parent_id}. This would create a circular reference."))
-                            return
-                    except ValueError:
-                        print(utils.format_error(f"Invalid parent ID: {parent_arg}"))
-                        return
-                i += 2
-            elif tokens[i] == '-link' and i + 1 < len(tokens):
-                links_arg = tokens[i + 1]
-                if links_arg.lower() in ['none', 'null']:
-                    new_links = []  # Empty list means remove all links
-                else:
-                    try:
-                        # Parse comma-separated IDs
-                        link_ids = [int(id_str.strip()) for id_str in links_arg.split(',')]
-                        # Validate that each linked conversation exists
-                        for link_id in link_ids:
-                            linked_conversation = self.db_manager.get_conversation(link_id)
-                            if not linked_conversation:
-                                print(utils.format_error(f"Linked conversation with ID {link_id} not found."))
-                                return
-                        
-                        new_links = link_ids
-                    except ValueError:
-                        print(utils.format_error(f"Invalid link IDs: {links_arg}. Use comma-separated numeric IDs."))
-                        return
-                i += 2
-            elif tokens[i] == '-unlink' and i + 1 < len(tokens):
-                unlink_arg = tokens[i + 1]
-                try:
-                    # Parse comma-separated IDs to unlink
-                    unlink_ids = [int(id_str.strip()) for id_str in unlink_arg.split(',')]
-                    # Validate that each conversation to unlink exists
-                    for unlink_id in unlink_ids:
-                        unlink_conversation = self.db_manager.get_conversation(unlink_id)
-                        if not unlink_conversation:
-                            print(utils.format_error(f"Conversation to unlink with ID {unlink_id} not found."))
-                            return
-                except ValueError:
-                    print(utils.format_error(f"Invalid unlink IDs: {unlink_arg}. Use comma-separated numeric IDs."))
-                    return
-                i += 2
-            else:
+            option = _EDIT_OPTIONS.get(tokens[i])
+            if option is None or i + 1 >= len(tokens):
                 print(utils.format_error(f"Invalid syntax near: {tokens[i]}"))
                 print(utils.format_error("Use: edit <id> [-subject \"<new subject>\"] [-parent <id|None>] [-link <id>[,<id>,...]] [-unlink <id>[,<id>,...]]"))
                 return
+            
+            key, parse_value = option
+            try:
+                options[key] = parse_value(tokens[i + 1])
+            except ValueError as e:
+                print(utils.format_error(str(e)))
+                return
+            i += 2
+        
+        # Use sentinel values to distinguish "not provided" from "provided as None"
+        NO_VALUE_PROVIDED = object()  # Sentinel object to differentiate
+        new_subject = options.get('subject', NO_VALUE_PROVIDED)
+        new_parent_id = options.get('parent', NO_VALUE_PROVIDED)
+        new_links = options.get('link', NO_VALUE_PROVIDED)
+        unlink_ids = options.get('unlink', NO_VALUE_PROVIDED)
+        
+        # Validate every referenced conversation ID with a single query
+        parent_ids = [new_parent_id] if new_parent_id not in (None, NO_VALUE_PROVIDED) else []
+        link_ids = new_links if new_links is not NO_VALUE_PROVIDED else []
+        unlink_check_ids = unlink_ids if unlink_ids is not NO_VALUE_PROVIDED else []
+        existing_ids = self.db_manager.exists_many(parent_ids + link_ids + unlink_check_ids)
+        
+        if parent_ids:
+            if new_parent_id not in existing_ids:
+                print(utils.format_error(f"Parent conversation with ID {new_parent_id} not found."))
+                return
+            
+            # Check for circular reference (cannot set a child as parent)
+            if self._would_create_circular_reference(conv_id, new_parent_id):
+                print(utils.format_error(f"Cannot set parent to {new_parent_id}. This would create a circular reference."))
+                return
+        
+        # Report every missing ID of a kind in one line before giving up
+        missing_link_ids = _unique_missing(link_ids, existing_ids)
+        missing_unlink_ids = _unique_missing(unlink_check_ids, existing_ids)
+        if missing_link_ids:
+            print(utils.format_error(_format_missing_ids("Linked conversation", "Linked conversations", missing_link_ids)))
+        if missing_unlink_ids:
+            print(utils.format_error(_format_missing_ids("Conversation to unlink", "Conversations to unlink", missing_unlink_ids)))
+        if missing_link_ids or missing_unlink_ids:
+            return
         
         # Validate that at least one field is being updated
         if new_subject is NO_VALUE_PROVIDED and new_parent_id is NO_VALUE_PROVIDED and new_links is NO_VALUE_PROVIDED and unlink_ids is NO_VALUE_PROVIDED:
@@ -231,39 +409,31 @@ class CLIHandler(cmd.Cmd):
                 else:
                     changes_made.append(f"Updated parent to {new_parent_id}")
             
-            # Update links if provided
+            # Work out link changes first so they can be written in a single transaction
+            # A conversation cannot be linked to or unlinked from itself
+            links_to_set = None
             if new_links is not NO_VALUE_PROVIDED:
-                # First, remove all existing links for this conversation
-                self.db_manager.remove_all_conversation_links(conv_id)
-                
-                # Add new links
+                links_to_set = [link_id for link_id in new_links if link_id != conv_id]
+                if len(links_to_set) != len(new_links):
+                    print(utils.format_error(f"Cannot link conversation {conv_id} to itself."))
+            
+            links_to_remove = None
+            if unlink_ids is not NO_VALUE_PROVIDED:
+                links_to_remove = [unlink_id for unlink_id in unlink_ids if unlink_id != conv_id]
+                if len(links_to_remove) != len(unlink_ids):
+                    print(utils.format_error(f"Cannot unlink conversation {conv_id} from itself."))
+            
+            if links_to_set is not None or links_to_remove:
+                self.db_manager.apply_link_changes(conv_id, links_to_set, links_to_remove)
+            
+            if links_to_set is not None:
                 if new_links:  # If the list is not empty
-                    for link_id in new_links:
-                        # Prevent linking to itself
-                        if link_id == conv_id:
-                            print(utils.format_error(f"Cannot link conversation {conv_id} to itself."))
-                            continue
-                        self.db_manager.add_conversation_link(conv_id, link_id)
-                    
                     changes_made.append(f"Updated links to: {', '.join(map(str, new_links))}")
                 else:
                     changes_made.append("Removed all links")
             
-            # Unlink specific conversations if provided
-            if unlink_ids is not NO_VALUE_PROVIDED:
-                for unlink_id in unlink_ids:
-                    # Prevent unlinking from itself
-                    if unlink_id == conv_id:
-                        print(utils.format_error(f"Cannot unlink conversation {conv_id} from itself."))
-                        continue
-                    # Try to remove the link in both directions
-                    try:
-                        self.db_manager.remove_conversation_link(conv_id, unlink_id)
-                        # Also try removing the reverse link in case it exists
-                        self.db_manager.remove_conversation_link(unlink_id, conv_id)
-                        changes_made.append(f"Unlinked from conversation {unlink_id}")
-                    except Exception as e:
-                        print(utils.format_error(f"Error unlinking from conversation {unlink_id}: {e}"))
+            for unlink_id in links_to_remove or []:
+                changes_made.append(f"Unlinked from conversation {unlink_id}")
         
             # Print results
             for change in changes_made:
@@ -283,16 +453,13 @@ class CLIHandler(cmd.Cmd):
         Returns:
             Parsed data from the modified content
         """
-        import tempfile
-        import subprocess
-        import os
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(initial_content)
-            temp_file_path = temp_file.name
+        # Overwrite the edit file reused across editor sessions
+        temp_file_path = self._get_edit_file_path()
         
         try:
+            with open(temp_file_path, 'w', encoding='utf-8') as temp_file:
+                temp_file.write(initial_content)
+            
             # Determine the appropriate editor based on the operating system
             # Check for EDITOR environment variable first, then VISUAL, then platform defaults
             editor = os.environ.get('EDITOR') or os.environ.get('VISUAL')
@@ -310,32 +477,12 @@ class CLIHandler(cmd.Cmd):
             if os.name == 'nt' and editor.lower() in ['default', 'system', 'default_app', 'system_default']:
                 # If user specifies a special keyword, use the system default application
                 # This will use the file association for .txt files
-                import time
-                import os.path
-                
                 # Use os.startfile to open with default application
                 os.startfile(temp_file_path)
                 
-                print("File opened with default application. Please save and close the file to continue...")
-                
-                # Wait for the user to finish editing by periodically checking if the file modification time has changed
-                initial_mtime = os.path.getmtime(temp_file_path)
-                timeout = 300  # 5 minutes timeout
-                start_time = time.time()
-                
-                while time.time() - start_time < timeout:
-                    time.sleep(2)  # Check every 2 seconds
-                    try:
-                        current_mtime = os.path.getmtime(temp_file_path)
-                        # If modification time has changed, assume user has saved
-                        if current_mtime != initial_mtime:
-                            print("File has been modified. Continuing...")
-                            break
-                    except OSError:
-                        # File might be temporarily locked during save operation
-                        continue
-                else:
-                    print("Timeout reached. Continuing with current content...")
+                # The default application does not tell us when editing ends, so block
+                # on the user instead of polling the file's modification time
+                input("File opened with default application. Save the file, then press Enter to continue...")
             else:
                 # Launch the editor to edit the temporary file
                 # This will block until the editor process is closed
@@ -356,24 +503,45 @@ class CLIHandler(cmd.Cmd):
         except Exception as e:
             print(utils.format_error(f"Error processing content: {e}"))
             return None
-        finally:
-            # Clean up the temporary file
-            try:
-                os.remove(temp_file_path)
-            except OSError:
-                pass  # Ignore errors in removing temporary file
     
-    def _edit_conversation_in_external_editor(self, conv_id: int, conversation: tuple):
+    def _get_edit_file_path(self) -> str:
+        """Return the temporary file used for editor sessions, creating it on first use.
+        
+        The file is created once per handler and removed when the process exits, so
+        repeated edits skip creating and deleting a file each time.
+        
+        Returns:
+            Path of the temporary edit file
+        """
+        if self._edit_file_path is None:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as temp_file:
+                self._edit_file_path = temp_file.name
+            atexit.register(self._remove_edit_file)
+        return self._edit_file_path
+    
+    def _remove_edit_file(self):
+        """Delete the temporary edit file if one was created."""
+        if self._edit_file_path is None:
+            return
+        try:
+            os.remove(self._edit_file_path)
+        except OSError:
+            pass  # Ignore errors in removing temporary file
+        self._edit_file_path = None
+    
+    def _edit_conversation_in_external_editor(self, conv_id: int, conversation: 'Conversation'):
         """Open conversation in external editor for comprehensive editing.
         
         Args:
             conv_id: ID of the conversation to edit
-            conversation: The conversation tuple to edit
+            conversation: The conversation row to edit
         """
-        import os
+        # Fetch the current links once; they fill the edit file and are compared
+        # against the edited links afterwards
+        existing_link_ids = self.db_manager.get_conversation_link_ids(conv_id)
         
         # Convert conversation to plain text format
-        text_content = utils.conversation_to_text(conversation, self.db_manager)
+        text_content = utils.conversation_to_text(conversation, linked_ids=existing_link_ids)
         
         # Open editor with the content
         updated_data = self._open_editor_with_content(
@@ -385,16 +553,17 @@ class CLIHandler(cmd.Cmd):
         if updated_data is None:
             return
             
-        # Update the conversation in the database
+        # Collect the changed fields so they are written with a single UPDATE
         changes_made = []
+        fields = {}
         
         # Update subject if it changed
-        if updated_data['subject'] != conversation[1]:  # subject is at index 1
-            self.db_manager.update_subject(conv_id, updated_data['subject'])
+        if updated_data['subject'] != conversation.subject:
+            fields['subject'] = updated_data['subject']
             changes_made.append(f"Updated subject to: {utils.format_subject(updated_data['subject'])}")
         
         # Update parent if it changed
-        if updated_data['pid'] != conversation[5]:  # pid is at index 5
+        if updated_data['pid'] != conversation.pid:
             if updated_data['pid'] is not None:
                 # Validate the new parent ID exists
                 parent_conversation = self.db_manager.get_conversation(updated_data['pid'])
@@ -407,57 +576,34 @@ class CLIHandler(cmd.Cmd):
                     print(utils.format_error(f"Cannot set parent to {updated_data['pid']}. This would create a circular reference."))
                     return
             
-            self.db_manager.update_conversation_parent(conv_id, updated_data['pid'])
+            fields['pid'] = updated_data['pid']
             if updated_data['pid'] is None:
                 changes_made.append(f"Updated parent to None (now root conversation)")
             else:
                 changes_made.append(f"Updated parent to {updated_data['pid']}")
         
         # Update user prompt if it changed
-        if updated_data['user_prompt'] != conversation[3]:  # user_prompt is at index 3
-            # For now, we just update the user prompt directly
-            conn = sqlite3.connect(self.db_manager.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE conversations
-                SET user_prompt = ?
-                WHERE id = ?
-            ''', (updated_data['user_prompt'], conv_id))
-            
-            conn.commit()
-            conn.close()
+        if updated_data['user_prompt'] != conversation.user_prompt:
+            fields['user_prompt'] = updated_data['user_prompt']
             changes_made.append(f"Updated user prompt")
         
         # Update LLM response if it changed
-        if updated_data['llm_response'] != conversation[4]:  # llm_response is at index 4
-            # For now, we just update the llm_response directly
-            conn = sqlite3.connect(self.db_manager.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE conversations
-                SET llm_response = ?
-                WHERE id = ?
-            ''', (updated_data['llm_response'], conv_id))
-            
-            conn.commit()
-            conn.close()
+        if updated_data['llm_response'] != conversation.llm_response:
+            fields['llm_response'] = updated_data['llm_response']
             changes_made.append(f"Updated LLM response")
         
+        self.db_manager.update_conversation_fields(conv_id, **fields)
+        
         # Update linked conversations if they changed
-        existing_linked_ids = set(self.db_manager.get_conversation_link_ids(conv_id))
+        existing_linked_ids = set(existing_link_ids)
         new_linked_ids = set(updated_data['linked_ids'])
         
         if existing_linked_ids != new_linked_ids:
-            # Remove all existing links
-            self.db_manager.remove_all_conversation_links(conv_id)
-            
-            # Add new links
+            # Check every conversation to link to with a single query
+            found_ids = self.db_manager.exists_many(list(new_linked_ids))
+            links_to_set = []
             for link_id in new_linked_ids:
-                # Check if the conversation to link to exists
-                linked_conversation = self.db_manager.get_conversation(link_id)
-                if not linked_conversation:
+                if link_id not in found_ids:
                     print(utils.format_error(f"Cannot link to conversation {link_id} - it does not exist."))
                     continue
                 
@@ -466,10 +612,10 @@ class CLIHandler(cmd.Cmd):
                     print(utils.format_error(f"Cannot link conversation {conv_id} to itself."))
                     continue
                 
-                try:
-                    self.db_manager.add_conversation_link(conv_id, link_id)
-                except ValueError as e:
-                    print(utils.format_error(f"Error linking to conversation {link_id}: {e}"))
+                links_to_set.append(link_id)
+            
+            # Replace all existing links with the valid new ones
+            self.db_manager.apply_link_changes(conv_id, new_links=links_to_set)
             
             changes_made.append(f"Updated linked conversations to: {list(new_linked_ids)}")
         
@@ -490,18 +636,8 @@ class CLIHandler(cmd.Cmd):
         Returns:
             True if setting new_parent_id as parent would create a circular reference, False otherwise
         """
-        # If we're trying to set the same conversation as its own parent, that's circular
-        if conv_id == new_parent_id:
-            return True
-        
-        # Check if new_parent_id is in the descendant chain of conv_id
-        # This would create a circular reference
-        descendants = self.db_manager.get_descendant_conversations(conv_id)
-        for descendant in descendants:
-            if descendant[0] == new_parent_id:  # descendant[0] is the ID
-                return True
-        
-        return False
+        # A conversation cannot be its own parent, nor can it be moved under one of its descendants
+        return conv_id == new_parent_id or self.db_manager.is_descendant(conv_id, new_parent_id)
 
     def do_list(self, arg):
         """List top-level conversations."""
@@ -511,11 +647,23 @@ class CLIHandler(cmd.Cmd):
             print("No top-level conversations found.")
             return
         
-        print("\nTop-level conversations:")
-        for conv in conversations:
-            conv_id, subject, _, _, _, _, user_prompt_timestamp, _ = conv
-            print(f"- {utils.format_subject(subject)} (id: {conv_id}, created on: {user_prompt_timestamp})")
-        print()
+        self._write_conversation_list("\nTop-level conversations:", conversations)
+    
+    def _write_conversation_list(self, header: str, conversations: list):
+        """Write a header and one line per conversation to stdout in a single call.
+        
+        Args:
+            header: Line printed above the list
+            conversations: Conversation rows to list
+        """
+        subject_prefix, subject_suffix = utils.SUBJECT_PREFIX, utils.SUBJECT_SUFFIX
+        lines = [header]
+        lines.extend(
+            f"- {subject_prefix}{conv.subject}{subject_suffix} (id: {conv.id}, created on: {conv.user_prompt_timestamp})"
+            for conv in conversations
+        )
+        # End with a blank line after the list
+        sys.stdout.write("\n".join(lines) + "\n\n")
     
     def do_open(self, arg):
         """Open and display a conversation tree: open <id>"""
@@ -529,27 +677,21 @@ class CLIHandler(cmd.Cmd):
             print(utils.format_error("Invalid conversation ID. Please provide a numeric ID."))
             return
         
-        # Get the conversation details to find its parent
-        conversation = self.db_manager.get_conversation(conv_id)
-        if not conversation:
+        # Get the conversation tree; its root row also tells us the parent
+        tree = self.db_manager.get_conversation_tree(conv_id)
+        if not tree:
             print(utils.format_error(f"Conversation with ID {conv_id} not found."))
             return
         
         # Get parent conversation if it exists
-        parent_id = conversation[5]  # pid is at index 5
+        parent_id = tree['pid']
         if parent_id is not None:
             parent_conversation = self.db_manager.get_conversation(parent_id)
             if parent_conversation:
-                parent_subject = parent_conversation[1]  # subject is at index 1
-                parent_timestamp = parent_conversation[6]  # user_prompt_timestamp is at index 6
+                parent_subject = parent_conversation.subject
+                parent_timestamp = parent_conversation.user_prompt_timestamp
                 print(f"{utils.format_subject(parent_subject)} (id: {parent_id}, created on: {parent_timestamp}) [parent]")
         
-        # Get the conversation tree
-        tree = self.db_manager.get_conversation_tree(conv_id)
-        if not tree:
-            print(utils.format_error(f"Conversation with ID {conv_id} not found."))
-            return
-        
         # Set this as the current parent for follow-up questions
         self.current_parent_id = conv_id
         
@@ -557,7 +699,9 @@ class CLIHandler(cmd.Cmd):
         self._print_conversation_tree(tree, show_full_content=True)
     
     def _print_conversation_tree(self, tree: dict, prefix: str = "", is_last: bool = True, show_full_content: bool = False):
-        """Recursively print the conversation tree with ASCII tree characters.
+        """Print the conversation tree with ASCII tree characters.
+        
+        The whole tree is formatted first and printed in a single call.
         
         Args:
             tree: The conversation tree to print
@@ -565,44 +709,90 @@ class CLIHandler(cmd.Cmd):
             is_last: Whether this is the last child at this level
             show_full_content: Whether to show full prompt/response for all nodes or only subjects for children
         """
-        # Print the current conversation
-        connector = "└─ " if is_last else "├─ "
-        print(f"{prefix}{connector}{utils.format_subject(tree['subject'])} (id: {tree['id']}, created on: {tree['user_prompt_timestamp']})")
+        lines = []
+        
+        # Format the current conversation
+        connector = _CONNECTOR_LAST if is_last else _CONNECTOR_MORE
+        formatted_subject = utils.format_subject(tree['subject'])
+        lines.append(f"{prefix}{connector}{formatted_subject} (id: {tree['id']}, created on: {tree['user_prompt_timestamp']})")
         
-        # Print full content if this is the main node or if we're showing everything
+        # Format full content if this is the main node or if we're showing everything
         if show_full_content:
-            # Print user prompt and response if available
+            # Indentation shared by every detail line of this node
+            detail_prefix = f"  {prefix}  "
+            
+            # Format user prompt and response if available
             if tree['user_prompt']:
-                print(f"  {prefix}  Prompt:")
-                print(f"  {prefix}  {utils.format_prompt(tree['user_prompt'])}")
+                lines.append(f"{detail_prefix}Prompt:")
+                lines.append(f"{detail_prefix}{utils.format_prompt(tree['user_prompt'])}")
             if tree['llm_response']:
-                print(f"  {prefix}  Model: {tree['model_name']}")
-                print(f"  {prefix}  Response:")
-                print(f"  {prefix}  {utils.format_response(tree['llm_response'])}")
+                lines.append(f"{detail_prefix}Model: {tree['model_name']}")
+                lines.append(f"{detail_prefix}Response:")
+                lines.append(f"{detail_prefix}{utils.format_response(tree['llm_response'])}")
             
-            # Get and display linked conversations
+            # Get and format linked conversations
             linked_conversations = self.db_manager.get_linked_conversations(tree['id'])
             if linked_conversations:
-                print(f"  {prefix}  Linked conversations:")
+                lines.append(f"{detail_prefix}Linked conversations:")
+                subject_prefix, subject_suffix = utils.SUBJECT_PREFIX, utils.SUBJECT_SUFFIX
                 for linked_conv in linked_conversations:
-                    linked_id, linked_subject, _, _, _, _, linked_timestamp, _ = linked_conv
-                    print(f"  {prefix}    • {utils.format_subject(linked_subject)} (id: {linked_id}, created on: {linked_timestamp})")
+                    lines.append(f"{detail_prefix}  • {subject_prefix}{linked_conv.subject}{subject_suffix} (id: {linked_conv.id}, created on: {linked_conv.user_prompt_timestamp})")
         
         # Prepare prefix for children - if we're showing full content, the children will only show subjects
-        extension = "    " if is_last else "│   "
+        extension = _BRANCH_LAST if is_last else _BRANCH_MORE
         new_prefix = prefix + extension
         
-        # Recursively print children with only subject lines if we're showing full content
-        children = tree['children']
-        for i, child in enumerate(children):
-            is_child_last = (i == len(children) - 1)
-            # For children, only show subject lines unless show_full_content is False (for export)
-            self._print_conversation_tree(child, new_prefix, is_child_last, show_full_content=False)
+        # Descendants only ever show their subject lines
+        self._format_subject_lines(tree['children'], new_prefix, lines)
+        
+        print("\n".join(lines))
+    
+    def _format_subject_lines(self, children: list, prefix: str, lines: List[str]):
+        """Format the subject line of every node under a tree level, without recursion.
+        
+        Args:
+            children: Child nodes of the level to format
+            prefix: Prefix for the children's level
+            lines: List the formatted lines are appended to
+        """
+        # Stack of (node, prefix, is_last), pushed in reverse so the first child pops first
+        stack = [(child, prefix, i == len(children) - 1) for i, child in enumerate(children)]
+        stack.reverse()
+        subject_prefix, subject_suffix = utils.SUBJECT_PREFIX, utils.SUBJECT_SUFFIX
+        while stack:
+            node, node_prefix, is_last = stack.pop()
+            connector = _CONNECTOR_LAST if is_last else _CONNECTOR_MORE
+            lines.append(f"{node_prefix}{connector}{subject_prefix}{node['subject']}{subject_suffix} (id: {node['id']}, created on: {node['user_prompt_timestamp']})")
+            
+            grandchildren = node['children']
+            child_prefix = node_prefix + (_BRANCH_LAST if is_last else _BRANCH_MORE)
+            for i in range(len(grandchildren) - 1, -1, -1):
+                stack.append((grandchildren[i], child_prefix, i == len(grandchildren) - 1))
     
     def _stream_response_callback(self, response_part: str):
-        """Callback function to handle streaming response parts."""
-        sys.stdout.write(utils.format_response(response_part))
+        """Callback function to handle streaming response parts.
+        
+        Parts are buffered and written once a line is complete, once enough text has
+        built up, once the last write is more than _STREAM_FLUSH_INTERVAL old, or when
+        the client signals the end of the stream with an empty part.
+        """
+        if response_part:
+            self._stream_buf.append(response_part)
+            self._stream_buf_len += len(response_part)
+        if (not response_part or '\n' in response_part or self._stream_buf_len >= _STREAM_FLUSH_CHARS
+                or time.monotonic() - self._stream_last_flush >= _STREAM_FLUSH_INTERVAL):
+            self._flush_stream_output()
+    
+    def _flush_stream_output(self):
+        """Write any buffered response parts to stdout."""
+        if not self._stream_buf:
+            return
+        # The color codes are constant, so wrap the whole buffer once instead of each token
+        sys.stdout.write(utils.RESPONSE_PREFIX + "".join(self._stream_buf) + utils.RESPONSE_SUFFIX)
         sys.stdout.flush()  # Ensure the output is displayed immediately
+        self._stream_buf.clear()
+        self._stream_buf_len = 0
+        self._stream_last_flush = time.monotonic()
     
     def do_ask(self, arg):
         """
@@ -618,7 +808,7 @@ class CLIHandler(cmd.Cmd):
             return
         
         # Check if the prompt starts with @<id>
-        match = re.match(r'^@(\d+)\s+(.+)', arg, re.DOTALL)
+        match = _ASK_PARENT_RE.match(arg)
         if match:
             parent_id = int(match.group(1))
             prompt = match.group(2).strip()
@@ -634,24 +824,9 @@ class CLIHandler(cmd.Cmd):
             prompt = arg.strip()
         
         try:
-            # Create the conversation with the LLM with streaming
-            conv_id = self.conversation_tree.create_conversation(prompt, parent_id, self._stream_response_callback)
-            
-            # Add a newline after the response is complete
-            print()  # Move to the next line after the streaming response
-            
-            # Get the created conversation to get the subject
-            conversation = self.db_manager.get_conversation(conv_id)
-            if conversation:
-                subject = conversation[1]  # Subject is at index 1
-                print(f"\nSaved conversation {conv_id} — {utils.format_subject(subject)}")
-                
-                # Set this as the current parent for follow-up questions
-                self.current_parent_id = conv_id
-            else:
-                print(utils.format_error("Error: Created conversation not found in database."))
-                
+            self._create_conversation_with_llm(prompt, parent_id)
         except Exception as e:
+            self._flush_stream_output()
             print(utils.format_error(f"Error creating conversation: {e}"))
     
     def do_add(self, arg):
@@ -666,8 +841,6 @@ class CLIHandler(cmd.Cmd):
     
     def _add_via_file(self):
         """Open a temporary file for user to manually input conversation details."""
-        import os
-        
         # Create template content for the file with current parent ID if available
         template_content = self._create_add_file_template(parent_id=self.current_parent_id)
         
@@ -691,19 +864,18 @@ class CLIHandler(cmd.Cmd):
             print(utils.format_error("No meaningful content provided. Conversation not added."))
             return
         
-        # Validate parent if provided
-        if parent_id is not None:
-            parent_conv = self.db_manager.get_conversation(parent_id)
-            if not parent_conv:
-                print(utils.format_error(f"Parent conversation with ID {parent_id} not found."))
-                return
+        # Validate the parent and every linked conversation with a single query
+        parent_ids = [parent_id] if parent_id is not None else []
+        existing_ids = self.db_manager.exists_many(parent_ids + linked_ids)
         
-        # Validate linked conversations if provided
-        for link_id in linked_ids:
-            linked_conv = self.db_manager.get_conversation(link_id)
-            if not linked_conv:
-                print(utils.format_error(f"Linked conversation with ID {link_id} not found."))
-                return
+        if parent_ids and parent_id not in existing_ids:
+            print(utils.format_error(f"Parent conversation with ID {parent_id} not found."))
+            return
+        
+        missing_link_ids = _unique_missing(linked_ids, existing_ids)
+        if missing_link_ids:
+            print(utils.format_error(_format_missing_ids("Linked conversation", "Linked conversations", missing_link_ids)))
+            return
         
         # Generate a subject based on the prompt and response using the LLM
         subject = self.conversation_tree.ollama_client.generate_subject(user_prompt, llm_response)
@@ -718,11 +890,8 @@ class CLIHandler(cmd.Cmd):
         )
         
         # Add links if any were specified
-        for link_id in linked_ids:
-            try:
-                self.db_manager.add_conversation_link(conv_id, link_id)
-            except ValueError as e:
-                print(utils.format_error(f"Error linking conversation {conv_id} to {link_id}: {e}"))
+        if linked_ids:
+            self.db_manager.add_conversation_links(conv_id, linked_ids)
         
         print(f"\nAdded conversation {conv_id} — {utils.format_subject(subject)}")
         
@@ -759,8 +928,6 @@ LLM_RESPONSE_END
     
     def _ask_via_file(self):
         """Open a temporary file for user to input prompt and parent ID."""
-        import os
-        
         # Create template content for the file
         template_content = self._create_ask_file_template(self.current_parent_id)
         
@@ -792,22 +959,34 @@ LLM_RESPONSE_END
                 print(utils.format_error(f"Parent conversation with ID {parent_id} not found."))
                 return
         
+        self._create_conversation_with_llm(prompt, parent_id)
+    
+    def _create_conversation_with_llm(self, prompt: str, parent_id: Optional[int]):
+        """Stream the LLM's answer to the prompt, save it and make it the current parent.
+        
+        Args:
+            prompt: User's prompt
+            parent_id: Optional parent conversation ID
+        """
         # Create the conversation with the LLM with streaming
-        conv_id = self.conversation_tree.create_conversation(prompt, parent_id, self._stream_response_callback)
+        subject_error = None
+        try:
+            conv_id, subject = self.conversation_tree.create_conversation(prompt, parent_id, self._stream_response_callback)
+        except SubjectGenerationError as e:
+            conv_id, subject = e.conv_id, e.subject
+            subject_error = e
+        finally:
+            self._flush_stream_output()
         
         # Add a newline after the response is complete
         print()  # Move to the next line after the streaming response
         
-        # Get the created conversation to get the subject
-        conversation = self.db_manager.get_conversation(conv_id)
-        if conversation:
-            subject = conversation[1]  # Subject is at index 1
-            print(f"\nSaved conversation {conv_id} — {utils.format_subject(subject)}")
-            
-            # Set this as the current parent for follow-up questions
-            self.current_parent_id = conv_id
-        else:
-            print(utils.format_error("Error: Created conversation not found in database."))
+        if subject_error is not None:
+            print(utils.format_error(f"\nCould not generate a subject ({subject_error}); keeping \"{subject}\"."))
+        print(f"\nSaved conversation {conv_id} — {utils.format_subject(subject)}")
+        
+        # Set this as the current parent for follow-up questions
+        self.current_parent_id = conv_id
 
     def _create_ask_file_template(self, current_parent_id=None):
         """
@@ -845,52 +1024,81 @@ USER_PROMPT_END
             print(utils.format_error("Invalid conversation ID. Please provide a numeric ID."))
             return
         
-        # Get the conversation tree
-        tree = self.db_manager.get_conversation_tree(conv_id)
-        if not tree:
+        # Stream the subtree in tree order instead of building it in memory
+        rows = self.db_manager.iter_subtree(conv_id)
+        first_row = next(rows, None)
+        if first_row is None:
             print(utils.format_error(f"Conversation with ID {conv_id} not found."))
             return
         
         # Export the tree to markdown
+        temp_path = None
         try:
-            # Clear the file before starting
-            with open(output_file, 'w', encoding='utf-8') as f:
-                pass
+            # Write through a symlink to the file it points at instead of replacing the link
+            target_path = os.path.realpath(output_file)
+            try:
+                existing = os.stat(target_path)
+            except FileNotFoundError:
+                existing = None
             
-            self._export_tree_to_markdown(tree, output_file)
+            # Write every node's UTF-8 bytes to a temporary file next to the target and
+            # move it into place once complete, so a failed export never leaves a
+            # partial file behind
+            with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(target_path), prefix='.export-', suffix='.tmp', delete=False) as f:
+                temp_path = f.name
+                self._export_tree_to_markdown(itertools.chain([first_row], rows), f)
+            
+            # NamedTemporaryFile creates the file private to the user; give it the
+            # permissions of the file it replaces, or those a new file would get
+            if existing is None:
+                os.chmod(temp_path, 0o666 & ~_UMASK)
+            else:
+                os.chmod(temp_path, stat.S_IMODE(existing.st_mode))
+                if hasattr(os, 'chown') and (existing.st_uid, existing.st_gid) != (os.getuid(), os.getgid()):
+                    try:
+                        os.chown(temp_path, existing.st_uid, existing.st_gid)
+                    except PermissionError:
+                        pass  # Only privileged users can give files away
+            os.replace(temp_path, target_path)
             print(f"Exported conversation tree (ID: {conv_id}) to {output_file}")
         except Exception as e:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
             print(utils.format_error(f"Error exporting conversation: {e}"))
     
-    def _export_tree_to_markdown(self, tree: dict, file_path: str, level: int = 0):
-        """Recursively export the conversation tree to markdown format."""
-        indent = "# " + "#" * level  # Markdown heading level
+    def _export_tree_to_markdown(self, rows, f):
+        """Export conversations to markdown format as they are read from the database.
+        
+        Each node is rendered, encoded to UTF-8 and written with a single call; the
+        file object's own buffering batches the underlying writes.
         
-        with open(file_path, 'a', encoding='utf-8') as f:
-            # Write the subject as a heading
-            f.write(f"{indent} {tree['subject']}\n\n")
+        Args:
+            rows: (conversation, depth) tuples in tree order, as yielded by iter_subtree
+            f: Open binary file handle to write the markdown to
+        """
+        for node, depth in rows:
+            indent = "# " + "#" * depth  # Markdown heading level
             
-            # Write the prompt if available
-            if tree['user_prompt']:
-                f.write("**Prompt:**\n")
-                f.write(f"{tree['user_prompt']}\n\n")
+            # Subject as a heading
+            parts = [f"{indent} {node.subject}\n\n"]
             
-            # Write the response if available
-            if tree['llm_response']:
-                f.write("**Response:**\n")
-                f.write(f"{tree['llm_response']}\n\n")
-            
-            # Write metadata
-            f.write(f"**ID:** {tree['id']}\n")
-            f.write(f"**Model:** {tree['model_name']}\n")
-            f.write(f"**Created:** {tree['user_prompt_timestamp']}\n")
-            if tree['llm_response_timestamp']:
-                f.write(f"**Responded:** {tree['llm_response_timestamp']}\n")
-            f.write("\n---\n\n")
-        
-        # Recursively export children
-        for child in tree['children']:
-            self._export_tree_to_markdown(child, file_path, level + 1)
+            # Prompt and response if available
+            if node.user_prompt:
+                parts.append(f"**Prompt:**\n{node.user_prompt}\n\n")
+            if node.llm_response:
+                parts.append(f"**Response:**\n{node.llm_response}\n\n")
+            
+            # Metadata
+            parts.append(
+                f"**ID:** {node.id}\n"
+                f"**Model:** {node.model_name}\n"
+                f"**Created:** {node.user_prompt_timestamp}\n"
+            )
+            if node.llm_response_timestamp:
+                parts.append(f"**Responded:** {node.llm_response_timestamp}\n")
+            parts.append("\n---\n\n")
+            
+            f.write("".join(parts).encode('utf-8'))
     
     def do_summarize(self, arg):
         """Summarize a conversation: summarize <id>"""
@@ -912,10 +1120,10 @@ USER_PROMPT_END
         
         # Build the content to summarize
         content_parts = []
-        if conversation[3]:  # User prompt at index 3
-            content_parts.append(f"User Prompt: {conversation[3]}")
-        if conversation[4]:  # LLM Response at index 4
-            content_parts.append(f"LLM Response: {conversation[4]}")
+        if conversation.user_prompt:
+            content_parts.append(f"User Prompt: {conversation.user_prompt}")
+        if conversation.llm_response:
+            content_parts.append(f"LLM Response: {conversation.llm_response}")
         
         if not content_parts:
             print("No content to summarize in this conversation.")
@@ -931,8 +1139,10 @@ USER_PROMPT_END
                 summary_prompt, 
                 stream_callback=self._stream_response_callback
             )
+            self._flush_stream_output()
             print()  # Move to the next line after the streaming summary
         except Exception as e:
+            self._flush_stream_output()
             print(utils.format_error(f"Error generating summary: {e}"))
 
     def do_close(self, arg):
@@ -970,11 +1180,10 @@ USER_PROMPT_END
             print(f"No conversations found containing '{search_term}'.")
             return
         
-        print(f"\nFound {len(matching_conversations)} conversation(s) containing '{search_term}':")
-        for conv in matching_conversations:
-            conv_id, subject, _, _, _, _, user_prompt_timestamp, _ = conv
-            print(f"- {utils.format_subject(subject)} (id: {conv_id}, created on: {user_prompt_timestamp})")
-        print()
+        self._write_conversation_list(
+            f"\nFound {len(matching_conversations)} conversation(s) containing '{search_term}':",
+            matching_conversations
+        )
     
     def do_help(self, arg):
         """Show help for commands."""
@@ -983,25 +1192,7 @@ USER_PROMPT_END
             super().do_help(arg)
         else:
             # Show general help
-            print("\nPromptree CLI - Help")
-            print("=" * 50)
-            print("Available commands:")
-            print("  quit          - Quit the application")
-            print("  rm <id>[,<id>,...] - Remove conversations and their subtrees")
-            print("  edit <id> - Open conversation in external editor (plain text format) for comprehensive editing")
-            print("  edit <id> [-subject \"<new subject>\"] [-parent <id|None>] [-link <id>[,<id>,...]] [-unlink <id>[,<id>,...]] - Modify conversation")
-            print("  list         - List top-level conversations")
-            print("  open <id>    - Show conversation and its subtree")
-            print("  close        - Close current conversation context, reset to root")
-            print("  search <text> - Search for text in conversations (* wildcards, case-insensitive)")
-            print("  ask [@<id>] <prompt> - Ask a question with optional parent")
-            print("  ask - Open external editor to input a longer prompt and parent ID from a file")
-            print("  add - Open external editor to manually add a conversation with parent, links, prompt and response")
-            print("  export <id> <file> - Export conversation tree to markdown")
-            print("  summarize <id> - Summarize a conversation")
-            print("  help         - Show this help message")
-            print("\nFor help with a specific command, type: help <command>")
-            print()
+            sys.stdout.write(_HELP_TEXT)
 
     def emptyline(self):
         """Override empty line behavior to do nothing instead of repeating last command."""
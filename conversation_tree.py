@@ -1,12 +1,44 @@
-from typing import List, Optional, Callable
-from database import DatabaseManager
-from ollama_client import OllamaClient
+from typing import TYPE_CHECKING, List, Optional, Callable, Tuple
 from datetime import datetime
 
+from ollama_client import OllamaError
+
+if TYPE_CHECKING:
+    from database import DatabaseManager
+    from ollama_client import OllamaClient
+
+# Same limit generate_subject applies to the subjects it returns
+MAX_SUBJECT_LENGTH = 50
+
+
+def _subject_from_prompt(prompt: str) -> str:
+    """Derive a subject from the first line of the prompt."""
+    lines = prompt.strip().splitlines()
+    subject = lines[0].strip() if lines else ""
+    if len(subject) > MAX_SUBJECT_LENGTH:
+        subject = subject[:MAX_SUBJECT_LENGTH - 3] + "..."
+    return subject
+
+
+class SubjectGenerationError(Exception):
+    """Raised when a conversation was saved under a subject taken from its prompt
+    because the model could not generate one.
+    
+    Attributes:
+        conv_id: ID of the saved conversation
+        subject: Subject the conversation was saved under
+    """
+    
+    def __init__(self, conv_id: int, subject: str, error: OllamaError):
+        super().__init__(str(error))
+        self.conv_id = conv_id
+        self.subject = subject
+
+
 class ConversationTree:
     """Manages the conversation tree structure and context building."""
     
-    def __init__(self, db_manager: DatabaseManager, ollama_client: OllamaClient):
+    def __init__(self, db_manager: 'DatabaseManager', ollama_client: 'OllamaClient'):
         """
         Initialize the conversation tree manager.
         
@@ -34,17 +66,15 @@ class ConversationTree:
         
         context_parts = []
         for conv in conversation_chain:
-            _, subject, _, user_prompt, llm_response, _, prompt_timestamp, response_timestamp = conv
-            
-            context_parts.append(f"Subject: {subject}")
-            context_parts.append(f"User Prompt (at {prompt_timestamp}): {user_prompt}")
-            if llm_response:
-                context_parts.append(f"LLM Response (at {response_timestamp}): {llm_response}")
+            context_parts.append(f"Subject: {conv.subject}")
+            context_parts.append(f"User Prompt (at {conv.user_prompt_timestamp}): {conv.user_prompt}")
+            if conv.llm_response:
+                context_parts.append(f"LLM Response (at {conv.llm_response_timestamp}): {conv.llm_response}")
             context_parts.append("---")
         
         return "\n".join(context_parts)
     
-    def create_conversation(self, prompt: str, parent_id: Optional[int] = None, stream_callback: Optional[Callable[[str], None]] = None) -> int:
+    def create_conversation(self, prompt: str, parent_id: Optional[int] = None, stream_callback: Optional[Callable[[str], None]] = None) -> Tuple[int, str]:
         """
         Create a new conversation with the LLM.
         
@@ -54,7 +84,11 @@ class ConversationTree:
             stream_callback: Optional callback function to handle streaming response chunks
             
         Returns:
-            ID of the newly created conversation
+            Tuple of the new conversation's ID and its generated subject
+            
+        Raises:
+            SubjectGenerationError: If the subject request failed; the conversation
+                is still saved, under a subject taken from the prompt
         """
         # Determine the model name from the parent conversation or use a default
         model_name = self.ollama_client.model_name
@@ -69,8 +103,16 @@ class ConversationTree:
         # Generate response from LLM with streaming
         response = self.ollama_client.generate_response(prompt, context, stream_callback)
         
-        # Generate a subject for the conversation
-        subject = self.ollama_client.generate_subject(prompt, response)
+        llm_response_timestamp = datetime.now()
+        
+        # Generate a subject for the conversation, falling back to the prompt so a
+        # failed subject request cannot lose the response
+        subject_error = None
+        try:
+            subject = self.ollama_client.generate_subject(prompt, response)
+        except OllamaError as e:
+            subject = _subject_from_prompt(prompt)
+            subject_error = e
         
         # Add conversation to database
         conv_id = self.db_manager.add_conversation(
@@ -80,10 +122,12 @@ class ConversationTree:
             llm_response=response,
             pid=parent_id,
             user_prompt_timestamp=user_prompt_timestamp,
-            llm_response_timestamp=datetime.now()
+            llm_response_timestamp=llm_response_timestamp
         )
         
-        return conv_id
+        if subject_error is not None:
+            raise SubjectGenerationError(conv_id, subject, subject_error) from subject_error
+        return conv_id, subject
     
     def get_conversation_path(self, conv_id: int) -> List[int]:
         """
@@ -95,15 +139,4 @@ class ConversationTree:
         Returns:
             List of conversation IDs from root to the given conversation
         """
-        path = []
-        current_id = conv_id
-        
-        while current_id is not None:
-            path.insert(0, current_id)  # Insert at beginning to maintain order
-            conversation = self.db_manager.get_conversation(current_id)
-            if conversation:
-                current_id = conversation[5]  # pid is at index 5
-            else:
-                current_id = None
-        
-        return path
\ No newline at end of file
+        return self.db_manager.get_ancestor_ids(conv_id)
\ No newline at end of file
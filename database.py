@@ -1,7 +1,96 @@
 import sqlite3
 import os
+import re
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER for builds older than 3.32
+MAX_SQL_VARIABLES = 999
+
+# Page cache per connection (64 MiB, against SQLite's default of about 2 MiB)
+SQLITE_CACHE_SIZE_KIB = 64000
+
+# Seconds to wait on a database locked by another process before raising
+SQLITE_BUSY_TIMEOUT_SECONDS = 5.0
+
+# Bytes of the database file SQLite may read through memory mapping (256 MiB)
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# Columns of the conversations table that update_conversation_fields may set
+_UPDATABLE_FIELDS = ('subject', 'user_prompt', 'llm_response', 'pid')
+
+
+class Conversation(NamedTuple):
+    """A row of the conversations table, readable by field name or by index."""
+    id: int
+    subject: str
+    model_name: str
+    user_prompt: str
+    llm_response: Optional[str]
+    pid: Optional[int]
+    user_prompt_timestamp: datetime
+    llm_response_timestamp: Optional[datetime]
+
+
+def _conversation_row(cursor, row) -> Conversation:
+    """Row factory for queries that select every column of the conversations table."""
+    return Conversation(*row)
+
+
+def _chunked(ids: List[int], size: int = MAX_SQL_VARIABLES):
+    """Yield successive slices of ids small enough to bind in one IN (...) clause."""
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _insert_links(cursor, conversation_id: int, linked_conversation_ids: List[int]):
+    """Insert links from one conversation with a single executemany, skipping existing ones."""
+    cursor.executemany('''
+        INSERT OR IGNORE INTO conversation_links (conversation_id, linked_conversation_id)
+        VALUES (?, ?)
+    ''', [(conversation_id, link_id) for link_id in linked_conversation_ids])
+
+
+def _fts_substring_query(like_pattern: str) -> Optional[str]:
+    """Translate a '%term%' LIKE pattern into an equivalent trigram MATCH query.
+    
+    Args:
+        like_pattern: SQL LIKE pattern as built by the search command
+        
+    Returns:
+        FTS5 phrase query, or None if the pattern needs LIKE semantics
+        (inner wildcards, anchored matches, or terms shorter than one trigram)
+    """
+    if len(like_pattern) < 2 or not (like_pattern.startswith('%') and like_pattern.endswith('%')):
+        return None
+    
+    term = like_pattern[1:-1]
+    if len(term) < 3 or '%' in term or '_' in term:
+        return None
+    
+    # Quote as an FTS5 phrase so operators and punctuation are matched literally
+    return '"' + term.replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=64)
+def _like_regex(like_pattern: str):
+    """Compile a LIKE pattern into a regex that ignores case for every alphabet."""
+    parts = ('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in like_pattern)
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _unicode_like(like_pattern: Optional[str], value: Optional[str]) -> Optional[bool]:
+    """SQL function matching value against a LIKE pattern with Unicode case folding.
+    
+    SQLite's built-in LIKE only folds ASCII letters, while the trigram index folds
+    all of them; non-ASCII searches that cannot use the index go through this
+    instead so both paths agree on what matches.
+    """
+    if like_pattern is None or value is None:
+        return None
+    return _like_regex(like_pattern).fullmatch(value) is not None
+
 
 class DatabaseManager:
     """Manages SQLite database operations for the Promptree application."""
@@ -18,11 +107,42 @@ class DatabaseManager:
         else:
             self.db_path = db_path
         
+        # Opened on first use and reused by every method until close() is called
+        self._conn: Optional[sqlite3.Connection] = None
+        
         self.init_db()
     
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the shared connection, opening and tuning it on first use.
+        
+        Returns:
+            The connection used by every DatabaseManager method
+        """
+        if self._conn is None:
+            # Wait for another process's write lock instead of failing straight away
+            conn = sqlite3.connect(self.db_path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+            # WAL lets readers proceed during writes and needs fewer fsyncs per commit;
+            # NORMAL sync is durable in WAL mode except across power loss
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            # Keep more pages cached for tree walks and searches over the whole table
+            conn.execute(f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}')
+            # Serve reads from the OS page cache without copying into SQLite's buffers
+            conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES}')
+            conn.create_function('unicode_like', 2, _unicode_like)
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        """Close the shared connection. It is reopened if the manager is used again."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
     def init_db(self):
         """Initialize the database with required schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         # Create conversations table
@@ -40,8 +160,11 @@ class DatabaseManager:
             )
         ''')
         
-        # Create index on pid for faster tree traversal
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pid ON conversations(pid)')
+        # Index children by parent in timestamp order: tree traversal finds children
+        # through pid, and child and root listings read them pre-sorted instead of
+        # sorting. It supersedes the older pid-only index.
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pid_timestamp ON conversations(pid, user_prompt_timestamp)')
+        cursor.execute('DROP INDEX IF EXISTS idx_pid')
         
         # Create conversation_links table to store relationships between conversations
         cursor.execute('''
@@ -57,9 +180,67 @@ class DatabaseManager:
         
         # Create index for faster lookups of linked conversations
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_links ON conversation_links(conversation_id)')
+        # Links are also looked up and deleted from the target side
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversation_links_linked ON conversation_links(linked_conversation_id)')
+        
+        self.fts_enabled = self._init_fts(cursor)
         
         conn.commit()
-        conn.close()
+    
+    def _init_fts(self, cursor) -> bool:
+        """Create the full-text index used by search_conversations.
+        
+        The trigram tokenizer indexes every 3-character sequence, so a MATCH query
+        finds the same case-insensitive substrings as LIKE '%term%' without scanning
+        every row. Case is folded for all alphabets, not only ASCII. Triggers keep
+        the index in sync with the conversations table.
+        
+        Args:
+            cursor: Cursor on the connection used by init_db
+            
+        Returns:
+            True if the index is available, False if this SQLite build lacks FTS5 trigram support
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'")
+        already_exists = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                    subject, user_prompt, llm_response,
+                    content='conversations', content_rowid='id', tokenize='trigram case_sensitive 0'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+                INSERT INTO conversations_fts (rowid, subject, user_prompt, llm_response)
+                VALUES (new.id, new.subject, new.user_prompt, new.llm_response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, subject, user_prompt, llm_response)
+                VALUES ('delete', old.id, old.subject, old.user_prompt, old.llm_response);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS conversations_fts_update
+            AFTER UPDATE OF subject, user_prompt, llm_response ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, subject, user_prompt, llm_response)
+                VALUES ('delete', old.id, old.subject, old.user_prompt, old.llm_response);
+                INSERT INTO conversations_fts (rowid, subject, user_prompt, llm_response)
+                VALUES (new.id, new.subject, new.user_prompt, new.llm_response);
+            END
+        ''')
+        
+        # Index conversations that were stored before the full-text table existed
+        if not already_exists:
+            cursor.execute("INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+        
+        return True
     
     def add_conversation(self, subject: str, model_name: str, user_prompt: str, 
                         llm_response: str = None, pid: int = None,
@@ -82,7 +263,7 @@ class DatabaseManager:
         if user_prompt_timestamp is None:
             user_prompt_timestamp = datetime.now()
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -93,22 +274,22 @@ class DatabaseManager:
         
         new_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return new_id
     
-    def get_conversation(self, conv_id: int) -> Optional[Tuple]:
+    def get_conversation(self, conv_id: int) -> Optional[Conversation]:
         """Get a conversation by its ID.
         
         Args:
             conv_id: ID of the conversation to retrieve
             
         Returns:
-            Conversation tuple (id, subject, model_name, user_prompt, llm_response, 
-                               pid, user_prompt_timestamp, llm_response_timestamp) or None
+            Conversation row (id, subject, model_name, user_prompt, llm_response, 
+                              pid, user_prompt_timestamp, llm_response_timestamp) or None
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
         cursor.execute('''
             SELECT id, subject, model_name, user_prompt, llm_response, 
@@ -117,11 +298,34 @@ class DatabaseManager:
         ''', (conv_id,))
         
         result = cursor.fetchone()
-        conn.close()
         
         return result
     
-    def get_conversation_chain(self, conv_id: int) -> List[Tuple]:
+    def exists_many(self, ids: Iterable[int]) -> Set[int]:
+        """Return the subset of the given conversation IDs that exist.
+        
+        Args:
+            ids: Conversation IDs to check
+            
+        Returns:
+            Set of IDs from ids that are present in the conversations table
+        """
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        existing = set()
+        for chunk in _chunked(ids):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT id FROM conversations WHERE id IN ({placeholders})', chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+        
+        return existing
+    
+    def get_conversation_chain(self, conv_id: int) -> List[Conversation]:
         """Get the conversation chain from root to the given conversation ID.
         
         Args:
@@ -130,27 +334,36 @@ class DatabaseManager:
         Returns:
             List of conversations from root to the given conversation ID, ordered from root to leaf
         """
-        chain = []
-        current_id = conv_id
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
-        while current_id is not None:
-            conversation = self.get_conversation(current_id)
-            if conversation is None:
-                break
-            
-            chain.insert(0, conversation)  # Insert at beginning to maintain order
-            current_id = conversation[5]  # pid is at index 5
+        # Collect the whole ancestor chain in one statement instead of one lookup per level
+        cursor.execute('''
+            WITH RECURSIVE chain(id, pid, depth) AS (
+                SELECT id, pid, 0 FROM conversations WHERE id = ?
+                UNION ALL
+                SELECT c.id, c.pid, ch.depth + 1 FROM conversations c
+                JOIN chain ch ON c.id = ch.pid
+            )
+            SELECT c.id, c.subject, c.model_name, c.user_prompt, c.llm_response,
+                   c.pid, c.user_prompt_timestamp, c.llm_response_timestamp
+            FROM chain ch
+            JOIN conversations c ON c.id = ch.id
+            ORDER BY ch.depth DESC
+        ''', (conv_id,))
         
-        return chain
+        return cursor.fetchall()
     
-    def get_root_conversations(self) -> List[Tuple]:
+    def get_root_conversations(self) -> List[Conversation]:
         """Get all root conversations (those without a parent).
         
         Returns:
             List of root conversations ordered by timestamp (most recent first)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
         cursor.execute('''
             SELECT id, subject, model_name, user_prompt, llm_response, 
@@ -161,11 +374,10 @@ class DatabaseManager:
         ''')
         
         results = cursor.fetchall()
-        conn.close()
         
         return results
     
-    def get_child_conversations(self, parent_id: int) -> List[Tuple]:
+    def get_child_conversations(self, parent_id: int) -> List[Conversation]:
         """Get all child conversations of a given parent.
         
         Args:
@@ -174,8 +386,9 @@ class DatabaseManager:
         Returns:
             List of child conversations ordered by timestamp
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
         cursor.execute('''
             SELECT id, subject, model_name, user_prompt, llm_response, 
@@ -186,11 +399,10 @@ class DatabaseManager:
         ''', (parent_id,))
         
         results = cursor.fetchall()
-        conn.close()
         
         return results
     
-    def get_descendant_conversations(self, parent_id: int) -> List[Tuple]:
+    def get_descendant_conversations(self, parent_id: int) -> List[Conversation]:
         """Get all descendant conversations of a given parent (recursive).
         
         Args:
@@ -199,8 +411,9 @@ class DatabaseManager:
         Returns:
             List of all descendant conversations
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
         # Recursive CTE to get all descendants
         cursor.execute('''
@@ -221,10 +434,65 @@ class DatabaseManager:
         ''', (parent_id,))
         
         results = cursor.fetchall()
-        conn.close()
         
         return results
     
+    def is_descendant(self, ancestor_id: int, candidate_id: int) -> bool:
+        """Check whether a conversation is a descendant of another.
+        
+        Args:
+            ancestor_id: ID of the potential ancestor conversation
+            candidate_id: ID of the conversation to look for in the ancestor's subtree
+            
+        Returns:
+            True if candidate_id is somewhere below ancestor_id in the tree, False otherwise
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Walk up from the candidate rather than down from the ancestor: the
+        # parent chain is only as long as the tree is deep, while the subtree
+        # can be arbitrarily wide. UNION stops the walk if the data has a cycle.
+        cursor.execute('''
+            WITH RECURSIVE ancestors(id) AS (
+                SELECT pid FROM conversations WHERE id = ?
+                UNION
+                SELECT c.pid FROM conversations c
+                JOIN ancestors a ON c.id = a.id
+            )
+            SELECT EXISTS(SELECT 1 FROM ancestors WHERE id = ?)
+        ''', (candidate_id, ancestor_id))
+        
+        result = cursor.fetchone()[0]
+        
+        return bool(result)
+    
+    def get_ancestor_ids(self, conv_id: int) -> List[int]:
+        """Get the IDs on the path from the root down to a conversation.
+        
+        Args:
+            conv_id: ID of the conversation whose ancestors to fetch
+            
+        Returns:
+            List of conversation IDs from the root to conv_id, inclusive
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Follow the parent chain upwards in one statement instead of one lookup per level
+        cursor.execute('''
+            WITH RECURSIVE ancestors(id, depth) AS (
+                SELECT ?, 0
+                UNION ALL
+                SELECT c.pid, a.depth + 1 FROM conversations c
+                JOIN ancestors a ON c.id = a.id
+                WHERE c.pid IS NOT NULL
+            )
+            SELECT id FROM ancestors ORDER BY depth DESC
+        ''', (conv_id,))
+        
+        return [row[0] for row in cursor.fetchall()]
+    
     def update_subject(self, conv_id: int, new_subject: str):
         """Update the subject of a conversation.
         
@@ -232,7 +500,7 @@ class DatabaseManager:
             conv_id: ID of the conversation to update
             new_subject: New subject text
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -242,7 +510,6 @@ class DatabaseManager:
         ''', (new_subject, conv_id))
         
         conn.commit()
-        conn.close()
     
     def update_conversation_parent(self, conv_id: int, new_parent_id: Optional[int]):
         """Update the parent of a conversation.
@@ -251,7 +518,7 @@ class DatabaseManager:
             conv_id: ID of the conversation to update
             new_parent_id: New parent ID (None for root conversation)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -261,94 +528,243 @@ class DatabaseManager:
         ''', (new_parent_id, conv_id))
         
         conn.commit()
-        conn.close()
+    
+    def update_conversation_fields(self, conv_id: int, **fields):
+        """Update several columns of a conversation with a single UPDATE.
+        
+        Args:
+            conv_id: ID of the conversation to update
+            **fields: New values keyed by column name; any of subject, user_prompt,
+                llm_response and pid. Columns that are not passed are left unchanged.
+        """
+        unknown = set(fields) - set(_UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update unknown conversation fields: {sorted(unknown)}")
+        if not fields:
+            return
+        
+        # Column names come from the fixed whitelist; only the values are bound
+        columns = [column for column in _UPDATABLE_FIELDS if column in fields]
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            UPDATE conversations
+            SET {assignments}
+            WHERE id = ?
+        ''', [fields[column] for column in columns] + [conv_id])
+        
+        conn.commit()
     
     def delete_conversation(self, conv_id: int):
         """Delete a conversation and all its descendants.
         
+        Links touching any deleted conversation are removed in the same transaction.
+        The links table declares ON DELETE CASCADE, but SQLite only enforces it with
+        foreign keys switched on, which existing databases may not satisfy.
+        
         Args:
             conv_id: ID of the conversation to delete
         """
-        conn = sqlite3.connect(self.db_path)
+        self.delete_conversations_bulk([conv_id])
+    
+    def delete_conversations_bulk(self, ids: List[int]) -> int:
+        """Delete several conversations, all of their descendants and every link that touches them.
+        
+        Everything happens in a single transaction.
+        
+        Args:
+            ids: IDs of the conversations to delete
+            
+        Returns:
+            Number of conversations deleted, including descendants
+        """
+        ids = list(set(ids))
+        if not ids:
+            return 0
+        
+        conn = self._get_connection()
+        deleted = 0
+        
+        with conn:
+            cursor = conn.cursor()
+            for chunk in _chunked(ids):
+                placeholders = ','.join('?' * len(chunk))
+                doomed_cte = f'''
+                    WITH RECURSIVE doomed(id) AS (
+                        SELECT id FROM conversations WHERE id IN ({placeholders})
+                        UNION
+                        SELECT c.id FROM conversations c
+                        JOIN doomed d ON c.pid = d.id
+                    )
+                '''
+                
+                # Remove links first so none are left pointing at deleted conversations
+                cursor.execute(doomed_cte + '''
+                    DELETE FROM conversation_links
+                    WHERE conversation_id IN doomed OR linked_conversation_id IN doomed
+                ''', chunk)
+                
+                cursor.execute(doomed_cte + '''
+                    DELETE FROM conversations
+                    WHERE id IN doomed
+                ''', chunk)
+                # rowcount is not reported for statements starting with WITH
+                deleted += cursor.execute('SELECT changes()').fetchone()[0]
+        
+        return deleted
+    
+    def get_subtree_rows(self, root_id: int) -> List[Conversation]:
+        """Get a conversation and all of its descendants in a single query.
+        
+        Args:
+            root_id: ID of the conversation at the top of the subtree
+            
+        Returns:
+            List of conversation rows for the root and every descendant,
+            ordered by user prompt timestamp
+        """
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
-        # Use recursive CTE to delete all descendants
         cursor.execute('''
-            WITH RECURSIVE descendants AS (
-                SELECT id
+            WITH RECURSIVE subtree AS (
+                SELECT id, subject, model_name, user_prompt, llm_response, 
+                       pid, user_prompt_timestamp, llm_response_timestamp
                 FROM conversations
                 WHERE id = ?
-                UNION ALL
-                SELECT c.id
+                UNION
+                SELECT c.id, c.subject, c.model_name, c.user_prompt, c.llm_response, 
+                       c.pid, c.user_prompt_timestamp, c.llm_response_timestamp
                 FROM conversations c
-                JOIN descendants d ON c.pid = d.id
+                JOIN subtree s ON c.pid = s.id
             )
-            DELETE FROM conversations
-            WHERE id IN descendants
-        ''', (conv_id,))
+            SELECT id, subject, model_name, user_prompt, llm_response, 
+                   pid, user_prompt_timestamp, llm_response_timestamp
+            FROM subtree
+            ORDER BY user_prompt_timestamp ASC, id ASC
+        ''', (root_id,))
         
-        conn.commit()
-        conn.close()
+        results = cursor.fetchall()
+        
+        return results
+    
+    def iter_subtree(self, root_id: int) -> Iterator[Tuple[Conversation, int]]:
+        """Yield a conversation and its descendants in tree order without building the tree.
+        
+        Rows come in pre-order with siblings ordered by user prompt timestamp, the same
+        order as a depth-first walk of get_conversation_tree, and are read from the
+        cursor as they are consumed.
+        
+        Args:
+            root_id: ID of the conversation at the top of the subtree
+            
+        Yields:
+            (conversation, depth) tuples, with depth 0 for the root
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        # Each row carries a sort key made of its ancestors' (timestamp, id) segments.
+        # char(1) and char(2) sort below every character of a timestamp, so a parent
+        # precedes its children and shorter timestamps (no microseconds) sort first.
+        cursor.execute('''
+            WITH RECURSIVE subtree(id, depth, sort_path) AS (
+                SELECT id, 0, user_prompt_timestamp || char(2) || printf('%010d', id)
+                FROM conversations
+                WHERE id = ?
+                UNION ALL
+                SELECT c.id, s.depth + 1,
+                       s.sort_path || char(1) || c.user_prompt_timestamp || char(2) || printf('%010d', c.id)
+                FROM conversations c
+                JOIN subtree s ON c.pid = s.id
+            )
+            SELECT c.id, c.subject, c.model_name, c.user_prompt, c.llm_response,
+                   c.pid, c.user_prompt_timestamp, c.llm_response_timestamp, s.depth
+            FROM subtree s
+            JOIN conversations c ON c.id = s.id
+            ORDER BY s.sort_path
+        ''', (root_id,))
+        
+        for row in cursor:
+            yield Conversation._make(row[:-1]), row[-1]
     
     def get_conversation_tree(self, root_id: int) -> dict:
         """Get the conversation tree starting from a root.
         
+        The whole subtree is fetched with one query and assembled in memory.
+        
         Args:
             root_id: ID of the root conversation
             
         Returns:
             Dictionary representing the tree structure
         """
-        root_conversation = self.get_conversation(root_id)
-        if not root_conversation:
+        rows = self.get_subtree_rows(root_id)
+        
+        nodes = {}
+        for row in rows:
+            node = row._asdict()
+            node['children'] = []
+            nodes[row.id] = node
+        
+        tree = nodes.get(root_id)
+        if not tree:
             return None
         
-        tree = {
-            'id': root_conversation[0],
-            'subject': root_conversation[1],
-            'model_name': root_conversation[2],
-            'user_prompt': root_conversation[3],
-            'llm_response': root_conversation[4],
-            'pid': root_conversation[5],
-            'user_prompt_timestamp': root_conversation[6],
-            'llm_response_timestamp': root_conversation[7],
-            'children': []
-        }
-        
-        # Get direct children
-        children = self.get_child_conversations(root_id)
-        for child in children:
-            child_tree = self.get_conversation_tree(child[0])  # child[0] is the id
-            if child_tree:
-                tree['children'].append(child_tree)
+        # Rows are ordered by timestamp, so children end up in chronological order
+        for row in rows:
+            if row.id != root_id:
+                nodes[row.pid]['children'].append(nodes[row.id])
         
         return tree
 
-    def search_conversations(self, search_term: str) -> List[Tuple]:
+    def search_conversations(self, search_term: str) -> List[Conversation]:
         """Search for conversations containing the given term in subject, user_prompt, or llm_response.
         
+        Plain substring patterns ('%term%') are answered from the full-text index;
+        other LIKE patterns fall back to scanning the table.
+        
         Args:
-            search_term: Term to search for (supports % wildcards, case-insensitive)
+            search_term: Term to search for (supports % and _ wildcards; case-insensitive
+                for all alphabets on both the indexed and the scanning path)
             
         Returns:
             List of conversations matching the search term
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
 
-        # Search in subject, user_prompt, and llm_response fields (case-insensitive)
-        cursor.execute('''
-            SELECT id, subject, model_name, user_prompt, llm_response, 
-                   pid, user_prompt_timestamp, llm_response_timestamp
-            FROM conversations
-            WHERE LOWER(subject) LIKE LOWER(?)
-               OR LOWER(user_prompt) LIKE LOWER(?)
-               OR (llm_response IS NOT NULL AND LOWER(llm_response) LIKE LOWER(?))
-            ORDER BY user_prompt_timestamp DESC
-        ''', (search_term, search_term, search_term))
+        fts_query = _fts_substring_query(search_term) if self.fts_enabled else None
+        if fts_query is not None:
+            cursor.execute('''
+                SELECT id, subject, model_name, user_prompt, llm_response, 
+                       pid, user_prompt_timestamp, llm_response_timestamp
+                FROM conversations
+                WHERE id IN (SELECT rowid FROM conversations_fts WHERE conversations_fts MATCH ?)
+                ORDER BY user_prompt_timestamp DESC
+            ''', (fts_query,))
+        else:
+            # Search in subject, user_prompt, and llm_response fields. The built-in LIKE
+            # only ignores case for ASCII, so a pattern with other characters goes
+            # through unicode_like, which folds case the same way the trigram index does.
+            if search_term.isascii():
+                condition = 'subject LIKE ?1 OR user_prompt LIKE ?1 OR llm_response LIKE ?1'
+            else:
+                condition = 'unicode_like(?1, subject) OR unicode_like(?1, user_prompt) OR unicode_like(?1, llm_response)'
+            cursor.execute(f'''
+                SELECT id, subject, model_name, user_prompt, llm_response, 
+                       pid, user_prompt_timestamp, llm_response_timestamp
+                FROM conversations
+                WHERE {condition}
+                ORDER BY user_prompt_timestamp DESC
+            ''', (search_term,))
 
         results = cursor.fetchall()
-        conn.close()
 
         return results
     
@@ -359,7 +775,7 @@ class DatabaseManager:
             conversation_id: ID of the conversation to link from
             linked_conversation_id: ID of the conversation to link to
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
@@ -375,10 +791,31 @@ class DatabaseManager:
             
             conn.commit()
         except sqlite3.IntegrityError:
-            # Link already exists
+            # Link already exists; end the failed transaction before reporting it
+            conn.rollback()
             raise ValueError(f"Link already exists between conversation {conversation_id} and {linked_conversation_id}")
-        finally:
-            conn.close()
+    
+    def add_conversation_links(self, conversation_id: int, linked_conversation_ids: List[int]) -> int:
+        """Add links from a conversation to several others in a single transaction.
+        
+        Links that already exist are left as they are.
+        
+        Args:
+            conversation_id: ID of the conversation to link from
+            linked_conversation_ids: IDs of the conversations to link to
+            
+        Returns:
+            Number of links that were added
+        """
+        if conversation_id in linked_conversation_ids:
+            raise ValueError("Cannot link a conversation to itself")
+        
+        conn = self._get_connection()
+        
+        with conn:
+            cursor = conn.cursor()
+            _insert_links(cursor, conversation_id, linked_conversation_ids)
+            return cursor.rowcount
     
     def remove_conversation_link(self, conversation_id: int, linked_conversation_id: int):
         """Remove a link between two conversations.
@@ -387,7 +824,7 @@ class DatabaseManager:
             conversation_id: ID of the conversation that was linked from
             linked_conversation_id: ID of the conversation that was linked to
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -396,7 +833,6 @@ class DatabaseManager:
         ''', (conversation_id, linked_conversation_id))
         
         conn.commit()
-        conn.close()
     
     def remove_all_conversation_links(self, conversation_id: int):
         """Remove all links from a specific conversation.
@@ -404,49 +840,80 @@ class DatabaseManager:
         Args:
             conversation_id: ID of the conversation to remove all links from
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
-        # Remove links where this conversation is the source
+        # Remove links in both directions with one statement; each side has its own index
         cursor.execute('''
             DELETE FROM conversation_links
-            WHERE conversation_id = ?
-        ''', (conversation_id,))
-        
-        # Also remove links where this conversation is the target
-        cursor.execute('''
-            DELETE FROM conversation_links
-            WHERE linked_conversation_id = ?
+            WHERE conversation_id = ?1 OR linked_conversation_id = ?1
         ''', (conversation_id,))
         
         conn.commit()
-        conn.close()
     
-    def get_linked_conversations(self, conversation_id: int) -> List[Tuple]:
+    def apply_link_changes(self, conversation_id: int, new_links: Optional[List[int]] = None,
+                           unlink_ids: Optional[List[int]] = None):
+        """Replace and/or remove links of a conversation in a single transaction.
+        
+        Args:
+            conversation_id: ID of the conversation whose links are changed
+            new_links: If not None, all existing links (both directions) are replaced by links to these IDs
+            unlink_ids: IDs of conversations to unlink from, in both directions
+        """
+        if new_links and conversation_id in new_links:
+            raise ValueError("Cannot link a conversation to itself")
+        
+        conn = self._get_connection()
+        
+        with conn:
+            cursor = conn.cursor()
+            
+            if new_links is not None:
+                cursor.execute('''
+                    DELETE FROM conversation_links
+                    WHERE conversation_id = ? OR linked_conversation_id = ?
+                ''', (conversation_id, conversation_id))
+                
+                _insert_links(cursor, conversation_id, new_links)
+            
+            for chunk in _chunked(list(unlink_ids or []), (MAX_SQL_VARIABLES - 2) // 2):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'''
+                    DELETE FROM conversation_links
+                    WHERE (conversation_id = ? AND linked_conversation_id IN ({placeholders}))
+                       OR (linked_conversation_id = ? AND conversation_id IN ({placeholders}))
+                ''', [conversation_id, *chunk, conversation_id, *chunk])
+    
+    def get_linked_conversations(self, conversation_id: int) -> List[Conversation]:
         """Get all conversations linked to a given conversation.
         
         Args:
             conversation_id: ID of the conversation to get links for
             
         Returns:
-            List of tuples representing linked conversations (id, subject, model_name, user_prompt, llm_response, 
-            pid, user_prompt_timestamp, llm_response_timestamp)
+            List of Conversation rows representing linked conversations
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.row_factory = _conversation_row
         
-        # Get conversations linked to this one (both directions)
+        # One index seek per link direction instead of an OR join over both columns
         cursor.execute('''
             SELECT c.id, c.subject, c.model_name, c.user_prompt, c.llm_response, 
                    c.pid, c.user_prompt_timestamp, c.llm_response_timestamp
-            FROM conversations c
-            INNER JOIN conversation_links cl ON (c.id = cl.linked_conversation_id OR c.id = cl.conversation_id)
-            WHERE (cl.conversation_id = ? OR cl.linked_conversation_id = ?)
-              AND c.id != ?
-        ''', (conversation_id, conversation_id, conversation_id))
+            FROM (
+                SELECT id AS link_id, linked_conversation_id AS linked_id FROM conversation_links
+                WHERE conversation_id = ?1
+                UNION ALL
+                SELECT id, conversation_id FROM conversation_links
+                WHERE linked_conversation_id = ?1
+            ) l
+            INNER JOIN conversations c ON c.id = l.linked_id
+            WHERE c.id != ?1
+            ORDER BY l.link_id
+        ''', (conversation_id,))
         
         results = cursor.fetchall()
-        conn.close()
         
         return results
     
@@ -459,20 +926,21 @@ class DatabaseManager:
         Returns:
             List of conversation IDs that are linked to the given conversation
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
         
         # Get IDs of conversations linked to this one (both directions)
         cursor.execute('''
-            SELECT CASE 
-                WHEN cl.conversation_id = ? THEN cl.linked_conversation_id
-                ELSE cl.conversation_id
-            END as linked_id
-            FROM conversation_links cl
-            WHERE cl.conversation_id = ? OR cl.linked_conversation_id = ?
-        ''', (conversation_id, conversation_id, conversation_id))
+            SELECT linked_id FROM (
+                SELECT id AS link_id, linked_conversation_id AS linked_id FROM conversation_links
+                WHERE conversation_id = ?1
+                UNION ALL
+                SELECT id, conversation_id FROM conversation_links
+                WHERE linked_conversation_id = ?1
+            )
+            ORDER BY link_id
+        ''', (conversation_id,))
         
         results = [row[0] for row in cursor.fetchall()]
-        conn.close()
         
         return results
\ No newline at end of file
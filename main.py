@@ -1,9 +1,5 @@
 import argparse
 from typing import Optional
-from database import DatabaseManager
-from ollama_client import OllamaClient
-from conversation_tree import ConversationTree
-from cli import CLIHandler
 
 def main():
     parser = argparse.ArgumentParser(description='Promptree CLI - A tool for managing LLM conversations as a tree.')
@@ -11,6 +7,13 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing so --help and usage errors return without
+    # loading the database and HTTP client stacks
+    from database import DatabaseManager
+    from ollama_client import OllamaClient
+    from conversation_tree import ConversationTree
+    from cli import CLIHandler
+    
     # Initialize components
     db_manager = DatabaseManager()
     ollama_client = OllamaClient(model_name=args.model)
@@ -18,7 +21,11 @@ def main():
     cli_handler = CLIHandler(db_manager, conversation_tree, args.model)
     
     # Start the CLI loop
-    cli_handler.start_cli()
+    try:
+        cli_handler.start_cli()
+    finally:
+        ollama_client.close()
+        db_manager.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,86 @@
 import requests
 from typing import Optional, Callable
-import json
+import hashlib
+from collections import OrderedDict
+
+try:
+    # orjson parses the streamed lines faster and takes them as bytes
+    from orjson import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+except ImportError:
+    # The standard library parser accepts bytes as well
+    from json import loads as _json_loads, JSONDecodeError as _JSONDecodeError
+
+# Bytes requested per read of a streamed response. Ollama sends chunked responses, so
+# each read still returns as soon as the server flushes a chunk; a larger size only
+# lets long lines and bursts of lines arrive in fewer reads than requests' 512 bytes
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Instruction sent ahead of every prompt. Keeping it first and byte-identical lets the
+# server reuse its cached evaluation of the prompt's unchanged start from turn to turn
+ANSWER_DIRECTIVE = "Only output the final answer, no other text."
+
+# Number of generated subjects remembered per client, keyed by a digest of their input
+SUBJECT_CACHE_SIZE = 1024
+
+# Raw bytes of the fields read from the closing line of a streamed response. Quotes
+# inside JSON string values are always escaped, so neither can occur within a value
+_DONE_FIELD = b'"done":true'
+_RESPONSE_FIELD = b'"response":"'
+
+
+def _subject_cache_key(prompt: str, response: str) -> bytes:
+    """Return a short digest identifying a (prompt, response) pair."""
+    return hashlib.blake2b(f"{prompt}\x00{response}".encode('utf-8'), digest_size=16).digest()
+
+
+class OllamaError(Exception):
+    """Raised when a request to the Ollama server fails or its reply cannot be read."""
+
+
+def _scan_response_field(line: bytes) -> Optional[str]:
+    """Extract the "response" string from a raw JSON line without parsing the rest.
+    
+    Returns None when the field is missing or cannot be read, so the caller can
+    fall back to parsing the whole line.
+    """
+    start = line.find(_RESPONSE_FIELD)
+    if start == -1:
+        return None
+    start += len(_RESPONSE_FIELD)
+    
+    # The value ends at the first quote not escaped by an odd run of backslashes
+    end = line.find(b'"', start)
+    while end != -1:
+        backslash = end
+        while line[backslash - 1] == 0x5C:
+            backslash -= 1
+        if (end - backslash) % 2 == 0:
+            break
+        end = line.find(b'"', end + 1)
+    if end == -1:
+        return None
+    
+    try:
+        if b'\\' in line[start:end]:
+            return _json_loads(line[start - 1:end + 1])  # Let the parser undo the escapes
+        return line[start:end].decode('utf-8')
+    except ValueError:
+        return None
+
+
+def _parse_stream_line(line: bytes) -> dict:
+    """Parse one line of a streamed /api/generate response.
+    
+    The closing line also carries the model's token context, often thousands of
+    numbers that are never used, so only its response text is read from the raw
+    bytes. Other lines, and a closing line the scan cannot read, are parsed in full.
+    """
+    if _DONE_FIELD in line:
+        response_part = _scan_response_field(line)
+        if response_part is not None:
+            return {"response": response_part, "done": True}
+    return _json_loads(line)
+
 
 class OllamaClient:
     """Handles communication with the local Ollama model."""
@@ -16,6 +96,13 @@ class OllamaClient:
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
+        # Reused for every request so the connection to the server is kept alive
+        self.session = requests.Session()
+        self._subject_cache: "OrderedDict[bytes, str]" = OrderedDict()  # Least recently used first
+    
+    def close(self):
+        """Close the HTTP session and its pooled connections."""
+        self.session.close()
     
     def generate_response(self, prompt: str, context: Optional[str] = None, stream_callback: Optional[Callable[[str], None]] = None) -> str:
         """
@@ -24,12 +111,17 @@ class OllamaClient:
         Args:
             prompt: The user's prompt
             context: Optional context history to provide to the model
-            stream_callback: Optional callback function to handle streaming response chunks
+            stream_callback: Optional callback function to handle streaming response chunks;
+                called with an empty string once the stream has ended
             
         Returns:
             Generated response from the LLM
+            
+        Raises:
+            OllamaError: If the request fails or the streamed reply is not valid JSON
         """
-        # Combine context and prompt if context is provided
+        # Combine context and prompt if context is provided, with the parts that change
+        # least between requests first
         full_prompt = prompt
         if context:
             full_prompt = f"{context}\n\nUser: {prompt}"
@@ -37,41 +129,51 @@ class OllamaClient:
         # Prepare the request payload
         payload = {
             "model": self.model_name,
-            "prompt": full_prompt + "\n\nOnly output the final answer, no other text.",
+            "prompt": f"{ANSWER_DIRECTIVE}\n\n{full_prompt}",
             "stream": True  # Enable streaming
         }
         
         try:
             # Make the streaming API request to Ollama
-            response = requests.post(self.api_url, json=payload, stream=True)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            
-            # Process the streaming response
-            full_response = ""
-            for line in response.iter_lines():
-                if line:
-                    # Decode the line and parse as JSON
-                    chunk = json.loads(line.decode('utf-8'))
-                    
-                    # Extract the response part
-                    if "response" in chunk:
-                        response_part = chunk["response"]
-                        full_response += response_part
+            with self.session.post(self.api_url, json=payload, stream=True) as response:
+                response.raise_for_status()  # Raise an exception for bad status codes
+                
+                # Process the streaming response, collecting parts to join once at the end
+                response_parts = []
+                lines = response.iter_lines(chunk_size=STREAM_CHUNK_SIZE)
+                for line in lines:
+                    if line:
+                        # Parse the raw line as JSON
+                        chunk = _parse_stream_line(line)
+                        
+                        # Extract the response part
+                        if "response" in chunk:
+                            response_part = chunk["response"]
+                            response_parts.append(response_part)
+                            
+                            # If we have a callback, call it with the response part
+                            if stream_callback:
+                                stream_callback(response_part)
                         
-                        # If we have a callback, call it with the response part
-                        if stream_callback:
-                            stream_callback(response_part)
-                    
-                    # Check if we've reached the end of the response
-                    if chunk.get("done", False):
-                        break
+                        # Check if we've reached the end of the response
+                        if chunk.get("done", False):
+                            break
+                
+                # An empty part tells the callback the stream has ended
+                if stream_callback:
+                    stream_callback("")
+                
+                # Read the rest of the stream, normally only its closing chunk, so the
+                # connection goes back to the session's pool instead of being closed
+                for _ in lines:
+                    pass
             
-            return full_response
+            return "".join(response_parts)
             
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Error communicating with Ollama: {str(e)}")
-        except json.JSONDecodeError:
-            raise Exception("Error: Invalid response format from Ollama")
+            raise OllamaError(f"Error communicating with Ollama: {str(e)}")
+        except _JSONDecodeError:
+            raise OllamaError("Error: Invalid response format from Ollama")
     
     def generate_subject(self, prompt: str, response: str) -> str:
         """
@@ -83,7 +185,17 @@ class OllamaClient:
             
         Returns:
             Generated subject line
+            
+        Raises:
+            OllamaError: If the request fails or the streamed reply is not valid JSON
         """
+        # Identical input (a retry or a re-added conversation) reuses the earlier subject
+        cache_key = _subject_cache_key(prompt, response)
+        cached_subject = self._subject_cache.get(cache_key)
+        if cached_subject is not None:
+            self._subject_cache.move_to_end(cache_key)
+            return cached_subject
+        
         subject_prompt = f"Generate a concise, informative topic name (max 50 characters) for this conversation. Only output the topic name, no extra content:<prompt>{prompt}</prompt><response>{response}</response>"
         
         subject = self.generate_response(subject_prompt)
@@ -93,4 +205,8 @@ class OllamaClient:
         if len(subject) > 50:
             subject = subject[:47] + "..."
         
+        self._subject_cache[cache_key] = subject
+        if len(self._subject_cache) > SUBJECT_CACHE_SIZE:
+            self._subject_cache.popitem(last=False)
+        
         return subject
\ No newline at end of file
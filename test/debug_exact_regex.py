@@ -5,15 +5,15 @@ Test the exact regex patterns from the file
 
 import re
 
+# These are the exact patterns from the file (before Python processes them)
+# In Python source, we write r'^(\\d+)...' to get ^(\\d+)... after raw string processing
+# which results in ^(\d+)... for the actual regex engine
+SUBJECT_PATTERN = re.compile(r'^(\\d+)\\s+-subject\\s+"(.+)"$', re.DOTALL)
+PARENT_PATTERN = re.compile(r'^(\\d+)\\s+-parent\\s+(\\d+|None|none|null|NULL)$')
+
 def test_exact_patterns():
     """Test the exact regex patterns from the file"""
     
-    # These are the exact patterns from the file (before Python processes them)
-    # In Python source, we write r'^(\\d+)...' to get ^(\\d+)... after raw string processing
-    # which results in ^(\d+)... for the actual regex engine
-    subject_pattern = r'^(\\d+)\\s+-subject\\s+"(.+)"$'
-    parent_pattern = r'^(\\d+)\\s+-parent\\s+(\\d+|None|none|null|NULL)$'
-    
     test_cases = [
         '2 -subject "Updated Child Subject"',
         '2 -subject "Test"',
@@ -24,14 +24,14 @@ def test_exact_patterns():
     ]
     
     print("Testing EXACT patterns from file:")
-    print(f"Subject pattern: {subject_pattern}")
-    print(f"Parent pattern: {parent_pattern}")
+    print(f"Subject pattern: {SUBJECT_PATTERN.pattern}")
+    print(f"Parent pattern: {PARENT_PATTERN.pattern}")
     
     for test_case in test_cases:
         print(f"\nTesting: {test_case!r}")
         
-        subject_match = re.match(subject_pattern, test_case, re.DOTALL)
-        parent_match = re.match(parent_pattern, test_case.strip())
+        subject_match = SUBJECT_PATTERN.match(test_case)
+        parent_match = PARENT_PATTERN.match(test_case.strip())
         
         print(f"  Subject match: {subject_match.groups() if subject_match else 'No match'}")
         print(f"  Parent match: {parent_match.groups() if parent_match else 'No match'}")
@@ -3,7 +3,13 @@
 Debug the argument parsing for the edit command
 """
 
-import shlex
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import _split_edit_args
 
 def test_parsing():
     test_cases = [
@@ -17,7 +23,7 @@ def test_parsing():
     for test_cmd in test_cases:
         print(f"\nTesting: {test_cmd}")
         try:
-            tokens = shlex.split(test_cmd)
+            tokens = _split_edit_args(test_cmd)
             print(f"  Tokens: {tokens}")
             
             # Simulate the parsing logic
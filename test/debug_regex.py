@@ -5,14 +5,14 @@ Debug the regex patterns for edit command
 
 import re
 
+# Pattern for editing subject
+SUBJECT_PATTERN = re.compile(r'^(\\d+)\\s+-subject\\s+\"(.+)\"$', re.DOTALL)
+# Pattern for editing parent
+PARENT_PATTERN = re.compile(r'^(\\d+)\\s+-parent\\s+(\\d+|None|none|null|NULL)$')
+
 def test_regex_patterns():
     """Test the regex patterns used in the edit command"""
     
-    # Pattern for editing subject
-    subject_pattern = r'^(\\d+)\\s+-subject\\s+\"(.+)\"$'
-    # Pattern for editing parent
-    parent_pattern = r'^(\\d+)\\s+-parent\\s+(\\d+|None|none|null|NULL)$'
-    
     test_cases = [
         '2 -subject "Updated Child Subject"',
         '2 -subject "Test"',
@@ -28,8 +28,8 @@ def test_regex_patterns():
     for test_case in test_cases:
         print(f"\nTesting: {test_case!r}")
         
-        subject_match = re.match(subject_pattern, test_case, re.DOTALL)
-        parent_match = re.match(parent_pattern, test_case.strip())
+        subject_match = SUBJECT_PATTERN.match(test_case)
+        parent_match = PARENT_PATTERN.match(test_case.strip())
         
         print(f"  Subject match: {subject_match.groups() if subject_match else 'No match'}")
         print(f"  Parent match: {parent_match.groups() if parent_match else 'No match'}")
@@ -5,7 +5,6 @@ Simple test to debug the search functionality
 
 import os
 import sys
-import tempfile
 from datetime import datetime
 
 # Add the current directory to the path so we can import our modules
@@ -17,13 +16,9 @@ def test_database_directly():
     """Test database search directly."""
     print("Testing database search directly...")
     
-    # Create a temporary database for testing
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as temp_db:
-        temp_db_path = temp_db.name
-
+    # An in-memory database lives only as long as the manager's connection
+    db_manager = DatabaseManager(":memory:")
     try:
-        db_manager = DatabaseManager(temp_db_path)
-        
         # Add test data
         id1 = db_manager.add_conversation(
             subject="Python Programming Tutorial",
@@ -54,9 +49,7 @@ def test_database_directly():
         return True
         
     finally:
-        # Clean up the temporary database
-        if os.path.exists(temp_db_path):
-            os.remove(temp_db_path)
+        db_manager.close()
 
 if __name__ == "__main__":
     test_database_directly()
\ No newline at end of file
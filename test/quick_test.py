@@ -5,7 +5,6 @@ Quick test to verify edit functionality works with the new format
 
 import os
 import sys
-import tempfile
 from datetime import datetime
 
 # Add the current directory to the path so we can import our modules
@@ -18,13 +17,9 @@ def quick_test():
     """Quick test of basic functionality"""
     print("Quick test of edit functionality...")
     
-    # Create a temporary database for testing
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as temp_db:
-        temp_db_path = temp_db.name
-
+    # An in-memory database lives only as long as the manager's connection
+    db_manager = DatabaseManager(":memory:")
     try:
-        db_manager = DatabaseManager(temp_db_path)
-        
         # Mock Ollama client
         class MockOllamaClient:
             def __init__(self, model_name):
@@ -41,7 +36,7 @@ def quick_test():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create conversation
-        id1 = conversation_tree.create_conversation("First conversation", None, None)
+        id1, _ = conversation_tree.create_conversation("First conversation", None, None)
         
         print(f"Created conversation: {id1}")
         
@@ -93,7 +88,7 @@ def quick_test():
         db_manager.update_conversation_parent(id1, None)  # id1 was originally root anyway
         
         # Test 3: Combined edit
-        id2 = conversation_tree.create_conversation("Second conversation", None, None)
+        id2, _ = conversation_tree.create_conversation("Second conversation", None, None)
         print(f"\nTest 3: Combined edit for new conversation {id2}")
         f = io.StringIO()
         with redirect_stdout(f):
@@ -119,9 +114,7 @@ def quick_test():
         return all_ok
         
     finally:
-        # Clean up the temporary database
-        if os.path.exists(temp_db_path):
-            os.remove(temp_db_path)
+        db_manager.close()
 
 if __name__ == "__main__":
     if quick_test():
@@ -38,6 +38,46 @@ echo Testing multiple comma-separated linked IDs...
 python test/test_multiple_linked_ids.py
 if errorlevel 1 goto error
 
+echo Testing batched conversation ID lookups...
+python test/test_batch_queries.py
+if errorlevel 1 goto error
+
+echo Testing full-text search index...
+python test/test_search_fts.py
+if errorlevel 1 goto error
+
+echo Testing rm command...
+python test/test_rm_command.py
+if errorlevel 1 goto error
+
+echo Testing edit argument tokenizer...
+python test/test_edit_tokenizer.py
+if errorlevel 1 goto error
+
+echo Testing streamed response buffering...
+python test/test_stream_output.py
+if errorlevel 1 goto error
+
+echo Testing context history and conversation creation...
+python test/test_context_history.py
+if errorlevel 1 goto error
+
+echo Testing Ollama client subject cache...
+python test/test_ollama_client.py
+if errorlevel 1 goto error
+
+echo Testing export command...
+python test/test_export_command.py
+if errorlevel 1 goto error
+
+echo Testing database connection and field updates...
+python test/test_database.py
+if errorlevel 1 goto error
+
+echo Testing conversation tree queries...
+python test/test_tree_queries.py
+if errorlevel 1 goto error
+
 echo All tests completed successfully!
 goto end
 
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Temporary database shared by the test modules
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from database import DatabaseManager
+
+
+@contextmanager
+def temp_db_manager():
+    """Yield a DatabaseManager on a new database file that is removed afterwards."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_manager = DatabaseManager(os.path.join(temp_dir, "test.db"))
+        try:
+            yield db_manager
+        finally:
+            db_manager.close()
@@ -5,8 +5,8 @@ This tests the new feature where 'add' command opens a file to manually add conv
 """
 
 import os
+import re
 import sys
-import tempfile
 from datetime import datetime
 import unittest.mock
 
@@ -17,7 +17,13 @@ sys.path.insert(0, parent_dir)
 
 from database import DatabaseManager
 from cli import CLIHandler
+import utils
 
+# Patterns describing the add file format; utils.parse_add_file_content must agree with them
+USER_PROMPT_RE = re.compile(r'USER_PROMPT_START\s*\n(.*?)\n\s*USER_PROMPT_END', re.DOTALL)
+LLM_RESPONSE_RE = re.compile(r'LLM_RESPONSE_START\s*\n(.*?)\n\s*LLM_RESPONSE_END', re.DOTALL)
+PARENT_ID_RE = re.compile(r'^PARENT_ID:\s*(.*)', re.MULTILINE)
+LINKED_IDS_RE = re.compile(r'^LINKED_CONVERSATIONS_ID:\s*(.*)', re.MULTILINE)
 
 def create_add_file_template(parent_id=None, linked_ids=None):
     """
@@ -52,8 +58,6 @@ def parse_add_file_content(text_content):
     """
     Parse the content from the add command text file.
     """
-    import re
-    
     # Initialize with default values
     parsed_data = {
         'parent_id': None,
@@ -63,17 +67,17 @@ def parse_add_file_content(text_content):
     }
     
     # Extract user prompt between markers
-    user_prompt_match = re.search(r'USER_PROMPT_START\s*\n(.*?)\n\s*USER_PROMPT_END', text_content, re.DOTALL)
+    user_prompt_match = USER_PROMPT_RE.search(text_content)
     if user_prompt_match:
         parsed_data['user_prompt'] = user_prompt_match.group(1).strip()
     
     # Extract LLM response between markers
-    llm_response_match = re.search(r'LLM_RESPONSE_START\s*\n(.*?)\n\s*LLM_RESPONSE_END', text_content, re.DOTALL)
+    llm_response_match = LLM_RESPONSE_RE.search(text_content)
     if llm_response_match:
         parsed_data['llm_response'] = llm_response_match.group(1).strip()
     
     # Extract parent ID
-    parent_id_match = re.search(r'^PARENT_ID:\s*(.*)', text_content, re.MULTILINE)
+    parent_id_match = PARENT_ID_RE.search(text_content)
     if parent_id_match:
         parent_id_str = parent_id_match.group(1).strip()
         if parent_id_str.lower() in ('', 'none', 'null'):
@@ -85,7 +89,7 @@ def parse_add_file_content(text_content):
                 parsed_data['parent_id'] = None  # Invalid parent ID, set to None
     
     # Extract linked conversations ID
-    linked_ids_match = re.search(r'^LINKED_CONVERSATIONS_ID:\s*(.*)', text_content, re.MULTILINE)
+    linked_ids_match = LINKED_IDS_RE.search(text_content)
     if linked_ids_match:
         linked_ids_str = linked_ids_match.group(1).strip()
         if linked_ids_str:
@@ -104,13 +108,9 @@ def test_add_command():
     """Test the new add command functionality."""
     print("Testing add command with file input...")
     
-    # Create a temporary database for testing
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as temp_db:
-        temp_db_path = temp_db.name
-    
+    # An in-memory database lives only as long as the manager's connection
+    db_manager = DatabaseManager(":memory:")
     try:
-        db_manager = DatabaseManager(temp_db_path)
-        
         # Mock Ollama client to avoid requiring Ollama service
         class MockOllamaClient:
             def __init__(self, model_name):
@@ -133,9 +133,9 @@ def test_add_command():
                 self.ollama_client = ollama_client
             
             def create_conversation(self, prompt, parent_id, stream_callback):
-                # Simulate creating a conversation and return an ID
+                # Simulate creating a conversation and return its ID and subject
                 subject = self.ollama_client.generate_subject(prompt, f"Mock response to: {prompt}")
-                return self.db_manager.add_conversation(
+                conv_id = self.db_manager.add_conversation(
                     subject=subject,
                     model_name=self.ollama_client.model_name,
                     user_prompt=prompt,
@@ -143,6 +143,7 @@ def test_add_command():
                     pid=parent_id,
                     user_prompt_timestamp=datetime.now()
                 )
+                return conv_id, subject
         
         ollama_client = MockOllamaClient("test-model")
         conversation_tree = MockConversationTree(db_manager, ollama_client)
@@ -256,11 +257,36 @@ LLM_RESPONSE_END
         print("All add command file input tests passed!")
         
     finally:
-        # Clean up the temporary database
-        if os.path.exists(temp_db_path):
-            os.remove(temp_db_path)
+        db_manager.close()
+
+
+def test_parse_add_file_content_matches_patterns():
+    """The line scanner in utils reads add files the same way as the patterns above."""
+    filled_in = create_add_file_template(4, [1, 2]).replace(
+        "USER_PROMPT_START\n\n", "USER_PROMPT_START\n\n  First line\nPARENT_ID: 9\n\x0cSecond line\n\n"
+    ).replace(
+        "LLM_RESPONSE_START\n\n", "LLM_RESPONSE_START\nAnswer\n    indented\n"
+    )
+    samples = [
+        create_add_file_template(),
+        create_add_file_template(3, [5]),
+        filled_in,
+        filled_in.replace("\n", "\r\n"),
+        filled_in.replace("PARENT_ID: 4", "PARENT_ID: none").replace("1,2", "1, x"),
+        "PARENT_ID: 2\nUSER_PROMPT_START\nNever closed\n",
+    ]
+    
+    for text_content in samples:
+        assert utils.parse_add_file_content(text_content) == parse_add_file_content(text_content)
+    
+    parsed_data = utils.parse_add_file_content(filled_in)
+    assert parsed_data['parent_id'] == 4
+    assert parsed_data['user_prompt'] == "First line\nPARENT_ID: 9\n\x0cSecond line"
+    assert parsed_data['llm_response'] == "Answer\n    indented"
+    assert parsed_data['linked_ids'] == [1, 2]
 
 
 if __name__ == "__main__":
     test_add_command()
+    test_parse_add_file_content_matches_patterns()
     print("Test completed successfully!")
\ No newline at end of file
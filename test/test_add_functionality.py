@@ -51,9 +51,9 @@ def test_add_command():
                 self.ollama_client = ollama_client
             
             def create_conversation(self, prompt, parent_id, stream_callback):
-                # Simulate creating a conversation and return an ID
+                # Simulate creating a conversation and return its ID and subject
                 subject = self.ollama_client.generate_subject(prompt, f"Mock response to: {prompt}")
-                return self.db_manager.add_conversation(
+                conv_id = self.db_manager.add_conversation(
                     subject=subject,
                     model_name=self.ollama_client.model_name,
                     user_prompt=prompt,
@@ -61,6 +61,7 @@ def test_add_command():
                     pid=parent_id,
                     user_prompt_timestamp=datetime.now()
                 )
+                return conv_id, subject
         
         ollama_client = MockOllamaClient("test-model")
         conversation_tree = MockConversationTree(db_manager, ollama_client)
@@ -142,6 +143,7 @@ LLM_RESPONSE_END
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
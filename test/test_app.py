@@ -62,6 +62,7 @@ def test_database():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -94,6 +95,7 @@ def test_cli_construction():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the batched database lookups used to validate conversation IDs
+"""
+
+import io
+import os
+import sys
+import unittest.mock
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import CLIHandler
+from temp_db import temp_db_manager
+
+
+def test_exists_many():
+    """exists_many returns only the IDs present in the database"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("First", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Second", "test-model", "Prompt 2", "Response 2")
+
+        assert db_manager.exists_many([]) == set()
+        assert db_manager.exists_many([id1, id2, 999]) == {id1, id2}
+
+        # More IDs than SQLite can bind in a single statement
+        many_ids = list(range(1, 2500))
+        assert db_manager.exists_many(many_ids) == {id1, id2}
+
+
+def test_edit_reports_missing_link():
+    """edit reports all missing link and unlink IDs and makes no changes"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("First", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Second", "test-model", "Prompt 2", "Response 2")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+
+        f = io.StringIO()
+        with redirect_stdout(f):
+            cli_handler.do_edit(f"{id1} -link {id2},999")
+        output = f.getvalue()
+
+        assert "Linked conversation with ID 999 not found." in output
+        assert db_manager.get_conversation_link_ids(id1) == []
+
+        f = io.StringIO()
+        with redirect_stdout(f):
+            cli_handler.do_edit(f"{id1} -link 998,{id2},999,998 -unlink 997")
+        lines = f.getvalue().splitlines()
+
+        assert len(lines) == 2
+        assert "Linked conversations with IDs 998, 999 not found." in lines[0]
+        assert "Conversation to unlink with ID 997 not found." in lines[1]
+        assert db_manager.get_conversation_link_ids(id1) == []
+
+
+def test_add_via_file_reports_missing_links():
+    """add validates the parent and links together and lists every missing link"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("First", "test-model", "Prompt 1", "Response 1")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        parsed_data = {
+            'parent_id': id1,
+            'user_prompt': "Prompt",
+            'llm_response': "Response",
+            'linked_ids': [998, id1, 999],
+        }
+
+        f = io.StringIO()
+        with unittest.mock.patch.object(cli_handler, '_open_editor_with_content', return_value=parsed_data), \
+                unittest.mock.patch.object(db_manager, 'get_conversation', side_effect=AssertionError("per-ID lookup")), \
+                redirect_stdout(f):
+            cli_handler._add_via_file()
+
+        assert "Linked conversations with IDs 998, 999 not found." in f.getvalue()
+        assert db_manager.exists_many([id1 + 1]) == set()
+
+
+def test_editor_links_checked_in_bulk():
+    """Links saved from the external editor skip missing IDs and replace old links"""
+    with temp_db_manager() as db_manager:
+        ids = [db_manager.add_conversation(f"Conversation {n}", "test-model", "Prompt", "Response") for n in range(4)]
+        db_manager.add_conversation_link(ids[0], ids[3])
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+
+        conversation = db_manager.get_conversation(ids[0])
+        updated_data = {
+            'subject': conversation.subject,
+            'pid': conversation.pid,
+            'user_prompt': conversation.user_prompt,
+            'llm_response': conversation.llm_response,
+            'linked_ids': [ids[1], ids[2], 999],
+        }
+
+        f = io.StringIO()
+        with unittest.mock.patch.object(cli_handler, '_open_editor_with_content', return_value=updated_data), redirect_stdout(f):
+            cli_handler._edit_conversation_in_external_editor(ids[0], conversation)
+
+        assert "Cannot link to conversation 999 - it does not exist." in f.getvalue()
+        assert sorted(db_manager.get_conversation_link_ids(ids[0])) == [ids[1], ids[2]]
+
+
+if __name__ == "__main__":
+    test_exists_many()
+    test_edit_reports_missing_link()
+    test_add_via_file_reports_missing_links()
+    test_editor_links_checked_in_bulk()
+    print("Batch query tests passed!")
@@ -41,9 +41,9 @@ def test_circular_reference():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a chain: 1 -> 2 -> 3  (1 is parent of 2, 2 is parent of 3)
-        id1 = conversation_tree.create_conversation("First conversation", None, None)
-        id2 = conversation_tree.create_conversation("Second conversation", id1, None)
-        id3 = conversation_tree.create_conversation("Third conversation", id2, None)
+        id1, _ = conversation_tree.create_conversation("First conversation", None, None)
+        id2, _ = conversation_tree.create_conversation("Second conversation", id1, None)
+        id3, _ = conversation_tree.create_conversation("Third conversation", id2, None)
         
         print(f"Created conversation chain: {id1} -> {id2} -> {id3}")
         
@@ -83,7 +83,7 @@ def test_circular_reference():
             return False
         
         # Test with unrelated conversation (should be OK)
-        id4 = conversation_tree.create_conversation("Fourth conversation", None, None)
+        id4, _ = conversation_tree.create_conversation("Fourth conversation", None, None)
         print(f"\nTesting if {id4} can become parent of {id1} (should be OK):")
         is_circular = cli_handler._would_create_circular_reference(id1, id4)
         print(f"Result: {is_circular}")
@@ -98,6 +98,7 @@ def test_circular_reference():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
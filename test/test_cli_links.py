@@ -106,6 +106,7 @@ def test_cli_functionality():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
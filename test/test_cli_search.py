@@ -42,7 +42,7 @@ def test_cli_search():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a conversation with "Python" in the subject
-        id1 = conversation_tree.create_conversation("How to learn Python programming?", None, None)
+        id1, _ = conversation_tree.create_conversation("How to learn Python programming?", None, None)
         print(f"Created conversation with ID: {id1}")
         
         # Create CLI handler
@@ -82,6 +82,7 @@ def test_cli_search():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -47,7 +47,7 @@ def test_close_command():
         cli_handler = CLIHandler(db_manager, conversation_tree, "test-model")
         
         # Create a conversation to set as current parent
-        parent_id = conversation_tree.create_conversation("This is the parent prompt", None, None)
+        parent_id, _ = conversation_tree.create_conversation("This is the parent prompt", None, None)
         print(f"Created parent conversation with ID: {parent_id}")
         
         # Manually set the current parent ID to simulate having an open conversation
@@ -90,6 +90,7 @@ def test_close_command():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -139,6 +140,7 @@ def test_close_command_with_arg():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -43,9 +43,9 @@ def test_combined_edit():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create conversations
-        id1 = conversation_tree.create_conversation("First conversation", None, None)
-        id2 = conversation_tree.create_conversation("Second conversation", id1, None)
-        id3 = conversation_tree.create_conversation("Third conversation", None, None)  # Root conversation
+        id1, _ = conversation_tree.create_conversation("First conversation", None, None)
+        id2, _ = conversation_tree.create_conversation("Second conversation", id1, None)
+        id3, _ = conversation_tree.create_conversation("Third conversation", None, None)  # Root conversation
         
         print(f"Created conversations: {id1} (root), {id2} (child of {id1}), {id3} (root)")
         
@@ -169,6 +169,7 @@ def test_combined_edit():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -41,9 +41,9 @@ def test_all_edit_features():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create conversations: 1 -> 2 -> 3
-        id1 = conversation_tree.create_conversation("First conversation", None, None)
-        id2 = conversation_tree.create_conversation("Second conversation", id1, None)
-        id3 = conversation_tree.create_conversation("Third conversation", id2, None)
+        id1, _ = conversation_tree.create_conversation("First conversation", None, None)
+        id2, _ = conversation_tree.create_conversation("Second conversation", id1, None)
+        id3, _ = conversation_tree.create_conversation("Third conversation", id2, None)
         
         print(f"Created conversation chain: {id1} -> {id2} -> {id3}")
         
@@ -87,7 +87,7 @@ def test_all_edit_features():
         
         # Test 3: Edit parent to different valid ID
         print("\nTest 3: Editing parent to different valid ID")
-        id4 = conversation_tree.create_conversation("Fourth conversation (root)", None, None)
+        id4, _ = conversation_tree.create_conversation("Fourth conversation (root)", None, None)
         f = io.StringIO()
         with redirect_stdout(f):
             cli_handler.do_edit(f"{id2} -parent {id4}")
@@ -163,6 +163,7 @@ def test_all_edit_features():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test how ConversationTree builds LLM context and saves new conversations
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import CLIHandler
+from conversation_tree import ConversationTree, SubjectGenerationError
+from ollama_client import OllamaError
+from temp_db import temp_db_manager
+
+
+def test_context_history_includes_every_response():
+    """Every ancestor from the root to the parent contributes its subject, prompt and response"""
+    with temp_db_manager() as db_manager:
+        parent_id = None
+        for n in range(5):
+            parent_id = db_manager.add_conversation(f"Subject {n}", "test-model", f"Prompt {n}", f"Response {n}", pid=parent_id)
+
+        conversation_tree = ConversationTree(db_manager, None)
+        context = conversation_tree.build_context_history(parent_id)
+
+        for n in range(5):
+            assert f"Subject: Subject {n}" in context
+            assert f"Prompt {n}" in context
+            assert f"Response {n}" in context
+        assert context.index("Subject 0") < context.index("Subject 4")
+        assert conversation_tree.build_context_history(999) == ""
+
+
+class MockOllamaClient:
+    """Stands in for the Ollama client, optionally failing subject generation"""
+    model_name = "test-model"
+
+    def __init__(self, subject_error=None):
+        self.subject_error = subject_error
+
+    def generate_response(self, prompt, context=None, stream_callback=None):
+        return f"Answer to {prompt}"
+
+    def generate_subject(self, prompt, response):
+        if self.subject_error:
+            raise self.subject_error
+        return "Generated subject"
+
+
+def test_create_conversation_saves_generated_subject():
+    """The row is saved once; a failed subject request falls back to the prompt and is reported by the CLI"""
+    with temp_db_manager() as db_manager:
+        conv_id, subject = ConversationTree(db_manager, MockOllamaClient()).create_conversation("What is WAL?")
+        assert subject == "Generated subject"
+        assert db_manager.get_conversation(conv_id).subject == "Generated subject"
+        assert db_manager.get_conversation(conv_id).llm_response == "Answer to What is WAL?"
+
+        long_prompt = "x" * 80 + "\nsecond line"
+        failing_tree = ConversationTree(db_manager, MockOllamaClient(OllamaError("subject request failed")))
+        try:
+            failing_tree.create_conversation(long_prompt, conv_id)
+            assert False, "SubjectGenerationError should be raised"
+        except SubjectGenerationError as e:
+            assert str(e) == "subject request failed"
+            assert e.subject == "x" * 47 + "..."
+            conversation = db_manager.get_conversation(e.conv_id)
+        assert conversation.subject == "x" * 47 + "..."
+        assert conversation.llm_response == f"Answer to {long_prompt}"
+
+        cli_handler = CLIHandler(db_manager, failing_tree, "test-model")
+        f = io.StringIO()
+        with redirect_stdout(f):
+            cli_handler.do_ask(f"@{conv_id} Why?")
+        output = f.getvalue()
+        assert 'Could not generate a subject (subject request failed); keeping "Why?".' in output
+        assert f"Saved conversation {cli_handler.current_parent_id}" in output
+        assert db_manager.get_conversation(cli_handler.current_parent_id).subject == "Why?"
+
+        # Anything other than a failed request is a bug and is not hidden
+        try:
+            ConversationTree(db_manager, MockOllamaClient(KeyError("cache"))).create_conversation("Lost", conv_id)
+            assert False, "KeyError should propagate"
+        except KeyError:
+            pass
+        children = db_manager.get_child_conversations(conv_id)
+        assert "Lost" not in [child.user_prompt for child in children]
+
+
+if __name__ == "__main__":
+    test_context_history_includes_every_response()
+    test_create_conversation_saves_generated_subject()
+    print("Conversation tree tests passed!")
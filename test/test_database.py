@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the database connection, schema and row access
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from temp_db import temp_db_manager
+
+
+def test_connection_is_shared_and_reopened():
+    """The manager reuses one WAL-mode connection and reopens it after close()"""
+    with temp_db_manager() as db_manager:
+        conn = db_manager._get_connection()
+        assert db_manager._get_connection() is conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA cache_size').fetchone()[0] == -64000
+        assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+        mmap_size = conn.execute('PRAGMA mmap_size').fetchone()
+        assert mmap_size is None or mmap_size[0] in (0, 256 * 1024 * 1024)  # 0 or no row if mmap is unsupported
+
+        conv_id = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        db_manager.close()
+        assert db_manager.get_conversation(conv_id).subject == "Root"
+        assert db_manager._get_connection() is not conn
+
+
+def test_listing_queries_use_indexes():
+    """Child and root listings read rows in index order and links are indexed both ways"""
+    with temp_db_manager() as db_manager:
+        conn = db_manager._get_connection()
+
+        def plan(query, params=()):
+            return " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+        children_plan = plan("SELECT id FROM conversations WHERE pid = ? ORDER BY user_prompt_timestamp ASC", (1,))
+        roots_plan = plan("SELECT id FROM conversations WHERE pid IS NULL ORDER BY user_prompt_timestamp DESC")
+        for query_plan in (children_plan, roots_plan):
+            assert "idx_pid_timestamp" in query_plan
+            assert "TEMP B-TREE" not in query_plan
+
+        links_plan = plan("SELECT id FROM conversation_links WHERE linked_conversation_id = ?", (1,))
+        assert "idx_conversation_links_linked" in links_plan
+
+
+def test_conversation_rows_have_named_fields():
+    """Rows returned by the database can be read by field name or by index"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Root", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Child", "test-model", "Prompt 2", None, pid=id1)
+
+        conversation = db_manager.get_conversation(id2)
+        assert conversation.id == conversation[0] == id2
+        assert conversation.subject == "Child"
+        assert conversation.pid == id1
+        assert conversation.llm_response is None
+        assert [row.id for row in db_manager.get_root_conversations()] == [id1]
+        assert [row.subject for row in db_manager.get_child_conversations(id1)] == ["Child"]
+
+
+def test_update_conversation_fields():
+    """update_conversation_fields sets only the given columns and rejects unknown ones"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Root", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Child", "test-model", "Prompt 2", "Response 2", pid=id1)
+
+        db_manager.update_conversation_fields(id2, user_prompt="New prompt", llm_response="New response", pid=None)
+        conversation = db_manager.get_conversation(id2)
+        assert conversation.subject == "Child"
+        assert conversation.user_prompt == "New prompt"
+        assert conversation.llm_response == "New response"
+        assert conversation.pid is None
+
+        try:
+            db_manager.update_conversation_fields(id2, model_name="other")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Unknown field was accepted")
+
+
+if __name__ == "__main__":
+    test_connection_is_shared_and_reopened()
+    test_listing_queries_use_indexes()
+    test_conversation_rows_have_named_fields()
+    test_update_conversation_fields()
+    print("Database tests passed!")
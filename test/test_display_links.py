@@ -100,6 +100,7 @@ def test_open_with_links():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -6,6 +6,7 @@ Test script for the new edit functionality
 import os
 import sys
 import tempfile
+import unittest.mock
 from datetime import datetime
 
 # Add the current directory to the path so we can import our modules
@@ -42,8 +43,8 @@ def test_edit_functionality():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a parent and child conversation
-        parent_id = conversation_tree.create_conversation("Parent conversation", None, None)
-        child_id = conversation_tree.create_conversation("Child conversation", parent_id, None)
+        parent_id, _ = conversation_tree.create_conversation("Parent conversation", None, None)
+        child_id, _ = conversation_tree.create_conversation("Child conversation", parent_id, None)
         
         print(f"Created parent conversation: {parent_id}")
         print(f"Created child conversation: {child_id}")
@@ -125,10 +126,32 @@ def test_edit_functionality():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
+def test_editor_reuses_temp_file():
+    """Consecutive editor sessions write to the same temporary file"""
+    cli_handler = CLIHandler(None, None, "test-model")
+    seen_paths = []
+
+    def fake_editor(command):
+        seen_paths.append(command[1])
+        with open(command[1], 'r', encoding='utf-8') as f:
+            assert f.read() == f"content {len(seen_paths)}"
+
+    with unittest.mock.patch.dict(os.environ, {'EDITOR': 'fake-editor'}), \
+            unittest.mock.patch('subprocess.run', side_effect=fake_editor):
+        assert cli_handler._open_editor_with_content("content 1", str.upper) == "CONTENT 1"
+        assert cli_handler._open_editor_with_content("content 2", str.upper) == "CONTENT 2"
+
+    assert seen_paths[0] == seen_paths[1]
+    assert os.path.exists(seen_paths[0])
+    cli_handler._remove_edit_file()
+    assert not os.path.exists(seen_paths[0])
+
 if __name__ == "__main__":
+    test_editor_reuses_temp_file()
     success = test_edit_functionality()
     if success:
         print("\nAll tests passed!")
@@ -42,8 +42,8 @@ def test_edit_functionality():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a parent and child conversation
-        parent_id = conversation_tree.create_conversation("Parent conversation", None, None)
-        child_id = conversation_tree.create_conversation("Child conversation", parent_id, None)
+        parent_id, _ = conversation_tree.create_conversation("Parent conversation", None, None)
+        child_id, _ = conversation_tree.create_conversation("Child conversation", parent_id, None)
         
         print(f"Created parent conversation: {parent_id}")
         print(f"Created child conversation: {child_id}")
@@ -93,6 +93,7 @@ def test_edit_functionality():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test that the edit argument tokenizer splits arguments exactly like shlex.split
+"""
+
+import os
+import shlex
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import _split_edit_args
+
+
+EDIT_ARGUMENTS = [
+    '',
+    '   ',
+    '5',
+    '5 -subject "New subject"',
+    '5 -subject "Quote \\" inside" -parent None',
+    "5 -subject 'single quoted \\ backslash'",
+    '5 -subject "tab\tand\nnewline"',
+    '5 -link 1,2,3 -unlink 4',
+    '5 -subject un"quoted"joined\'parts\'',
+    '5 -subject "escaped \\\\ backslash" -link 2',
+    '5 -subject back\\ slash\\ spaces',
+    '5 -subject ""',
+    '  5   -parent   7  ',
+    '5 -subject foo\xa0bar',
+    '5 -subject em\u2003space -link 2',
+    '5 -subject vertical\vtab\fform feed',
+    '\xa05\xa0',
+]
+
+
+def test_matches_shlex():
+    """Every argument string is split into the same tokens shlex produces"""
+    for arg in EDIT_ARGUMENTS:
+        assert _split_edit_args(arg) == shlex.split(arg), arg
+
+
+def test_unbalanced_input_raises():
+    """Unclosed quotes and trailing escapes raise ValueError like shlex"""
+    for arg in ['5 -subject "unclosed', "5 -subject 'unclosed", '5 -subject trailing\\',
+                '-"\\', '5 -subject "ends in escape\\', "5 -subject 'literal\\", '5 -"\\"\\',
+                '5 -subject \xa0"unclosed']:
+        try:
+            shlex.split(arg)
+        except ValueError as e:
+            expected = str(e)
+        try:
+            _split_edit_args(arg)
+        except ValueError as e:
+            assert str(e) == expected, arg
+        else:
+            raise AssertionError(f"No error for {arg!r}")
+
+
+if __name__ == "__main__":
+    test_matches_shlex()
+    test_unbalanced_input_raises()
+    print("Edit tokenizer tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test exporting a conversation tree to a markdown file
+"""
+
+import io
+import os
+import stat
+import sys
+import tempfile
+import unittest.mock
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import CLIHandler
+from temp_db import temp_db_manager
+
+
+def test_export_writes_tree():
+    """export writes every node of the subtree, parents before children"""
+    with temp_db_manager() as db_manager, tempfile.TemporaryDirectory() as temp_dir:
+        root = db_manager.add_conversation("Root", "test-model", "Root prompt", "Root response")
+        db_manager.add_conversation("Child", "test-model", "Child prompt", None, pid=root)
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        output_file = os.path.join(temp_dir, "tree export.md")
+
+        f = io.StringIO()
+        with redirect_stdout(f):
+            cli_handler.do_export(f"{root} {output_file}")
+
+        assert f"Exported conversation tree (ID: {root}) to {output_file}" in f.getvalue()
+        with open(output_file, encoding='utf-8') as exported:
+            content = exported.read()
+        assert content.startswith("#  Root\n\n**Prompt:**\nRoot prompt\n\n**Response:**\nRoot response\n\n")
+        assert "# # Child\n\n**Prompt:**\nChild prompt\n\n**ID:**" in content
+        assert not [name for name in os.listdir(temp_dir) if name.startswith(".export-")]
+
+        # The ID and file name may be separated by any whitespace
+        tab_file = os.path.join(temp_dir, "tab.md")
+        with redirect_stdout(io.StringIO()):
+            cli_handler.do_export(f"{root}\t{tab_file}")
+        assert os.path.exists(tab_file)
+
+
+def test_failed_export_keeps_existing_file():
+    """A failure part way through leaves the previous file untouched and no temporary file"""
+    with temp_db_manager() as db_manager, tempfile.TemporaryDirectory() as temp_dir:
+        root = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        output_file = os.path.join(temp_dir, "export.md")
+        with open(output_file, 'w', encoding='utf-8') as existing:
+            existing.write("previous export")
+
+        def write_then_fail(rows, f):
+            f.write(b"partial")
+            raise OSError("disk full")
+
+        f = io.StringIO()
+        with unittest.mock.patch.object(cli_handler, '_export_tree_to_markdown', side_effect=write_then_fail), \
+                redirect_stdout(f):
+            cli_handler.do_export(f"{root} {output_file}")
+
+        assert "Error exporting conversation: disk full" in f.getvalue()
+        with open(output_file, encoding='utf-8') as existing:
+            assert existing.read() == "previous export"
+        assert not [name for name in os.listdir(temp_dir) if name.startswith(".export-")]
+
+
+def test_export_keeps_existing_file_mode_and_symlink():
+    """Re-exporting keeps the target's permissions and writes through a symlink"""
+    if os.name != 'posix':
+        return  # Permission bits and symlinks are POSIX behaviour
+    
+    with temp_db_manager() as db_manager, tempfile.TemporaryDirectory() as temp_dir:
+        root = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        output_file = os.path.join(temp_dir, "export.md")
+        with open(output_file, 'w', encoding='utf-8') as existing:
+            existing.write("previous export")
+        os.chmod(output_file, 0o600)
+        link_file = os.path.join(temp_dir, "latest.md")
+        os.symlink(output_file, link_file)
+
+        f = io.StringIO()
+        with redirect_stdout(f):
+            cli_handler.do_export(f"{root} {output_file}")
+            cli_handler.do_export(f"{root} {link_file}")
+
+        assert stat.S_IMODE(os.stat(output_file).st_mode) == 0o600
+        assert os.path.islink(link_file)
+        with open(output_file, encoding='utf-8') as exported:
+            assert exported.read().startswith("#  Root")
+        assert not [name for name in os.listdir(temp_dir) if name.startswith(".export-")]
+
+
+if __name__ == "__main__":
+    test_export_writes_tree()
+    test_failed_export_keeps_existing_file()
+    test_export_keeps_existing_file_mode_and_symlink()
+    print("Export command tests passed!")
@@ -53,6 +53,7 @@ def test_json_conversion():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -2,14 +2,19 @@
 """
 Test script to verify the linked conversations editing functionality
 """
+import io
 import tempfile
 import os
 import sys
+import unittest.mock
+from contextlib import redirect_stdout
 
 # Add the parent directory to the Python path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from database import DatabaseManager
+from cli import CLIHandler
+from temp_db import temp_db_manager
 import utils
 
 def test_linked_conversations_editing():
@@ -76,8 +81,34 @@ def test_linked_conversations_editing():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
+def test_editor_reads_links_once():
+    """Editing fetches the current links once for both the edit file and the comparison"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("First", "test-model", "Prompt", "Response")
+        id2 = db_manager.add_conversation("Second", "test-model", "Prompt", "Response")
+        db_manager.add_conversation_link(id1, id2)
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        conversation = db_manager.get_conversation(id1)
+
+        def edit_subject(content, parse_function):
+            assert f"LINKED_CONVERSATIONS_ID: {id2}" in content
+            return parse_function(content.replace("SUBJECT: First", "SUBJECT: Renamed"))
+
+        f = io.StringIO()
+        with unittest.mock.patch.object(cli_handler, '_open_editor_with_content', side_effect=edit_subject), \
+                unittest.mock.patch.object(db_manager, 'get_conversation_link_ids', wraps=db_manager.get_conversation_link_ids) as link_ids, \
+                redirect_stdout(f):
+            cli_handler._edit_conversation_in_external_editor(id1, conversation)
+
+        assert link_ids.call_count == 1
+        assert db_manager.get_conversation(id1).subject == "Renamed"
+        assert db_manager.get_conversation_link_ids(id1) == [id2]
+
+
 if __name__ == "__main__":
-    test_linked_conversations_editing()
\ No newline at end of file
+    test_linked_conversations_editing()
+    test_editor_reads_links_once()
@@ -10,6 +10,7 @@ import sqlite3
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from database import DatabaseManager
+from temp_db import temp_db_manager
 
 def test_links_functionality():
     # Create a test database
@@ -116,8 +117,46 @@ def test_links_functionality():
     
     # Clean up
     conn.close()
+    db_manager.close()
     os.remove(test_db_path)
     print("Test completed successfully!")
 
+
+def test_apply_link_changes():
+    """apply_link_changes replaces links and unlinks in both directions"""
+    with temp_db_manager() as db_manager:
+        ids = [db_manager.add_conversation(f"Conversation {n}", "test-model", "Prompt", "Response") for n in range(5)]
+        db_manager.add_conversation_link(ids[4], ids[0])
+
+        db_manager.apply_link_changes(ids[0], new_links=[ids[1], ids[2], ids[3], ids[1]])
+        assert sorted(db_manager.get_conversation_link_ids(ids[0])) == [ids[1], ids[2], ids[3]]
+
+        db_manager.add_conversation_link(ids[4], ids[0])
+        db_manager.apply_link_changes(ids[0], unlink_ids=[ids[2], ids[4]] + list(range(1000, 2000)))
+        assert sorted(db_manager.get_conversation_link_ids(ids[0])) == [ids[1], ids[3]]
+
+        db_manager.apply_link_changes(ids[0], new_links=[])
+        assert db_manager.get_conversation_link_ids(ids[0]) == []
+
+
+def test_add_conversation_links():
+    """add_conversation_links inserts every new link once and skips existing ones"""
+    with temp_db_manager() as db_manager:
+        ids = [db_manager.add_conversation(f"Conversation {n}", "test-model", "Prompt", "Response") for n in range(4)]
+        db_manager.add_conversation_link(ids[0], ids[1])
+
+        assert db_manager.add_conversation_links(ids[0], [ids[1], ids[2], ids[3], ids[3]]) == 2
+        assert sorted(db_manager.get_conversation_link_ids(ids[0])) == [ids[1], ids[2], ids[3]]
+
+        try:
+            db_manager.add_conversation_links(ids[0], [ids[0]])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Self-link was accepted")
+
+
 if __name__ == "__main__":
-    test_links_functionality()
\ No newline at end of file
+    test_links_functionality()
+    test_apply_link_changes()
+    test_add_conversation_links()
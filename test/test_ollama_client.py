@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the Ollama client without contacting an Ollama server
+"""
+
+import os
+import sys
+import unittest.mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import ollama_client
+from ollama_client import OllamaClient
+
+
+class MockStreamResponse:
+    """Stands in for a streaming requests response"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, chunk_size=512):
+        return iter(self.lines)
+
+
+def test_generate_response_streams_parts():
+    """Streamed parts are passed to the callback and joined into the full response"""
+    client = OllamaClient("test-model")
+    lines = [
+        b'{"response": "Hello", "done": false}',
+        b'',
+        '{"response": ", w\u00f6rld", "done": false}'.encode('utf-8'),
+        b'{"response": "", "done": true}',
+        b'{"response": "ignored after done"}',
+    ]
+    parts = []
+
+    with unittest.mock.patch.object(client.session, 'post', return_value=MockStreamResponse(lines)) as post:
+        assert client.generate_response("Prompt", "Context", stream_callback=parts.append) == "Hello, w\u00f6rld"
+    assert parts == ["Hello", ", w\u00f6rld", "", ""]
+    # The fixed instruction leads, the new prompt comes last
+    assert post.call_args.kwargs['json']['prompt'] == f"{ollama_client.ANSWER_DIRECTIVE}\n\nContext\n\nUser: Prompt"
+
+    with unittest.mock.patch.object(client.session, 'post', return_value=MockStreamResponse([b'not json'])):
+        try:
+            client.generate_response("Prompt")
+            assert False, "Invalid JSON should raise"
+        except Exception as e:
+            assert str(e) == "Error: Invalid response format from Ollama"
+
+
+def test_closing_line_read_without_full_parse():
+    """The closing line's response is read from its raw bytes, falling back to a full parse"""
+    context = ",".join(str(n) for n in range(4000))
+    closing_line = ('{"model":"m","response":"say \\"hi\\"\\\\\\n\\u00e9 caf\u00e9","done":true,'
+                    '"context":[' + context + ']}').encode('utf-8')
+    assert ollama_client._parse_stream_line(closing_line) == {"response": 'say "hi"\\\n\u00e9 caf\u00e9', "done": True}
+    assert ollama_client._scan_response_field(closing_line) == 'say "hi"\\\n\u00e9 caf\u00e9'
+    assert ollama_client._scan_response_field(b'{"response":"Plain","done":true}') == "Plain"
+
+    # Lines the scan cannot read are parsed in full
+    assert ollama_client._parse_stream_line(b'{"done":true, "response": "Spaced"}') == {"done": True, "response": "Spaced"}
+    assert ollama_client._scan_response_field(b'{"response":"unterminated\\"}') is None
+    assert ollama_client._parse_stream_line(b'{"response":"Token","done":false}') == {"response": "Token", "done": False}
+
+
+def test_generate_subject_cached():
+    """Repeated subject requests for the same prompt and response reuse the first result"""
+    client = OllamaClient("test-model")
+
+    with unittest.mock.patch.object(client, 'generate_response', return_value='  "A subject"\n') as generate:
+        assert client.generate_subject("Prompt", "Response") == "A subject"
+        assert client.generate_subject("Prompt", "Response") == "A subject"
+        assert generate.call_count == 1
+
+        client.generate_subject("Prompt", "Other response")
+        assert generate.call_count == 2
+
+
+def test_subject_cache_evicts_least_recently_used():
+    """The cache keeps at most SUBJECT_CACHE_SIZE subjects, dropping the oldest unused one"""
+    client = OllamaClient("test-model")
+
+    with unittest.mock.patch.object(ollama_client, 'SUBJECT_CACHE_SIZE', 2), \
+            unittest.mock.patch.object(client, 'generate_response', side_effect=lambda prompt: "Subject") as generate:
+        client.generate_subject("First", "Response")
+        client.generate_subject("Second", "Response")
+        client.generate_subject("First", "Response")  # Now the most recently used
+        client.generate_subject("Third", "Response")  # Evicts "Second"
+        assert generate.call_count == 3
+
+        client.generate_subject("First", "Response")
+        assert generate.call_count == 3
+        client.generate_subject("Second", "Response")
+        assert generate.call_count == 4
+
+
+if __name__ == "__main__":
+    test_generate_response_streams_parts()
+    test_closing_line_read_without_full_parse()
+    test_generate_subject_cached()
+    test_subject_cache_evicts_least_recently_used()
+    print("Ollama client tests passed!")
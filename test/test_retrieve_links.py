@@ -80,6 +80,7 @@ def test_retrieve_linked_conversations():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the rm command, which deletes conversations together with their subtrees
+"""
+
+import io
+import os
+import sys
+import unittest.mock
+from contextlib import redirect_stdout
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from cli import CLIHandler
+from temp_db import temp_db_manager
+
+
+def test_rm_deletes_subtrees_and_links():
+    """rm removes every listed subtree in one go and reports missing IDs"""
+    with temp_db_manager() as db_manager:
+        root1 = db_manager.add_conversation("Root 1", "test-model", "Prompt", "Response")
+        child1 = db_manager.add_conversation("Child 1", "test-model", "Prompt", "Response", pid=root1)
+        grandchild1 = db_manager.add_conversation("Grandchild 1", "test-model", "Prompt", "Response", pid=child1)
+        root2 = db_manager.add_conversation("Root 2", "test-model", "Prompt", "Response")
+        keep = db_manager.add_conversation("Keep", "test-model", "Prompt", "Response")
+        db_manager.add_conversation_link(keep, grandchild1)
+        db_manager.add_conversation_link(root2, keep)
+
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+        cli_handler.current_parent_id = root1
+
+        f = io.StringIO()
+        with unittest.mock.patch('builtins.input', return_value='yes'), redirect_stdout(f):
+            cli_handler.do_rm(f"{root1},{root2},999")
+        output = f.getvalue()
+
+        assert "Conversation with ID 999 not found." in output
+        assert f"Deleted conversation {root1} and its subtree." in output
+        assert "Deleted 4 conversation(s) in total." in output
+        assert cli_handler.current_parent_id is None
+
+        assert db_manager.exists_many([root1, child1, grandchild1, root2, keep]) == {keep}
+        assert db_manager.get_conversation_link_ids(keep) == []
+
+
+def test_delete_conversation_removes_links():
+    """Deleting a single conversation also drops links to and from its subtree"""
+    with temp_db_manager() as db_manager:
+        root = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        child = db_manager.add_conversation("Child", "test-model", "Prompt", "Response", pid=root)
+        keep = db_manager.add_conversation("Keep", "test-model", "Prompt", "Response")
+        db_manager.add_conversation_link(keep, child)
+        db_manager.add_conversation_link(root, keep)
+
+        db_manager.delete_conversation(root)
+
+        assert db_manager.exists_many([root, child, keep]) == {keep}
+        count = db_manager._get_connection().execute('SELECT COUNT(*) FROM conversation_links').fetchone()[0]
+        assert count == 0
+
+
+def test_rm_canceled():
+    """Answering no leaves the conversations in place"""
+    with temp_db_manager() as db_manager:
+        conv_id = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+
+        f = io.StringIO()
+        with unittest.mock.patch('builtins.input', return_value='no'), redirect_stdout(f):
+            cli_handler.do_rm(str(conv_id))
+
+        assert "Deletion canceled." in f.getvalue()
+        assert db_manager.get_conversation(conv_id) is not None
+
+
+def test_rm_yes_flag_skips_confirmation():
+    """-y and --yes delete without prompting"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("First", "test-model", "Prompt", "Response")
+        id2 = db_manager.add_conversation("Second", "test-model", "Prompt", "Response")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+
+        f = io.StringIO()
+        with unittest.mock.patch('builtins.input', side_effect=AssertionError("prompted")), redirect_stdout(f):
+            cli_handler.do_rm(f"-y {id1}")
+            cli_handler.do_rm(f"{id2} --yes")
+
+        assert db_manager.exists_many([id1, id2]) == set()
+        assert "Deleted 1 conversation(s) in total." in f.getvalue()
+
+
+def test_rm_end_of_input_cancels():
+    """Running out of piped input at the prompt cancels instead of raising"""
+    with temp_db_manager() as db_manager:
+        conv_id = db_manager.add_conversation("Root", "test-model", "Prompt", "Response")
+        cli_handler = CLIHandler(db_manager, None, "test-model")
+
+        f = io.StringIO()
+        with unittest.mock.patch('builtins.input', side_effect=EOFError), redirect_stdout(f):
+            cli_handler.do_rm(str(conv_id))
+
+        assert "Deletion canceled." in f.getvalue()
+        assert db_manager.get_conversation(conv_id) is not None
+
+
+if __name__ == "__main__":
+    test_rm_deletes_subtrees_and_links()
+    test_delete_conversation_removes_links()
+    test_rm_canceled()
+    test_rm_yes_flag_skips_confirmation()
+    test_rm_end_of_input_cancels()
+    print("rm command tests passed!")
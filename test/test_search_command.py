@@ -42,9 +42,9 @@ def test_search_command():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create some test conversations
-        id1 = conversation_tree.create_conversation("This is the first conversation about Python", None, None)
-        id2 = conversation_tree.create_conversation("This is the second conversation about Java", None, None)
-        id3 = conversation_tree.create_conversation("Another conversation about JavaScript and Python", None, None)
+        id1, _ = conversation_tree.create_conversation("This is the first conversation about Python", None, None)
+        id2, _ = conversation_tree.create_conversation("This is the second conversation about Java", None, None)
+        id3, _ = conversation_tree.create_conversation("Another conversation about JavaScript and Python", None, None)
         
         print(f"Created conversations with IDs: {id1}, {id2}, {id3}")
         
@@ -105,6 +105,7 @@ def test_search_command():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -168,6 +169,7 @@ def test_database_search_function():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
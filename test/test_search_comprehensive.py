@@ -42,10 +42,10 @@ def test_search_comprehensive():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create test conversations
-        id1 = conversation_tree.create_conversation("Python programming basics", None, None)  # Subject contains "Python"
-        id2 = conversation_tree.create_conversation("JavaScript tutorial", None, None)       # Subject contains "JavaScript"
-        id3 = conversation_tree.create_conversation("Learning Java and JavaScript", None, None)  # Subject contains both
-        id4 = conversation_tree.create_conversation("Advanced Python concepts", None, None)      # Subject contains "Python"
+        id1, _ = conversation_tree.create_conversation("Python programming basics", None, None)  # Subject contains "Python"
+        id2, _ = conversation_tree.create_conversation("JavaScript tutorial", None, None)       # Subject contains "JavaScript"
+        id3, _ = conversation_tree.create_conversation("Learning Java and JavaScript", None, None)  # Subject contains both
+        id4, _ = conversation_tree.create_conversation("Advanced Python concepts", None, None)      # Subject contains "Python"
         
         print(f"Created conversations with IDs: {id1}, {id2}, {id3}, {id4}")
         
@@ -119,6 +119,7 @@ def test_search_comprehensive():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -152,7 +153,7 @@ def test_search_in_content():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a conversation with "machine learning" in the prompt
-        id1 = conversation_tree.create_conversation("How does machine learning work?", None, None)
+        id1, _ = conversation_tree.create_conversation("How does machine learning work?", None, None)
         print(f"Created conversation with ID: {id1}")
         
         # Create CLI handler
@@ -180,6 +181,7 @@ def test_search_in_content():
         
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
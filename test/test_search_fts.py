@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test that the full-text search index stays in sync with the conversations table
+"""
+
+import os
+import sys
+import unittest.mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from temp_db import temp_db_manager
+
+
+def _ids(results):
+    return sorted(row[0] for row in results)
+
+
+def test_search_index_matches_like_search():
+    """Indexed searches return the same rows as the LIKE fallback after inserts, updates and deletes"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Python basics", "test-model", "How do I learn PYTHON?", "Start small")
+        id2 = db_manager.add_conversation("JavaScript", "test-model", "What is a closure?", None)
+        id3 = db_manager.add_conversation("Cooking", "test-model", "Pasta recipe", "Boil water")
+
+        db_manager.update_subject(id3, "Cooking with python")
+        db_manager.delete_conversation(id2)
+
+        for term in ["%python%", "%PYTH%", "%closure%", "%boil water%", "%nothing here%"]:
+            indexed = db_manager.search_conversations(term)
+            fts_enabled = db_manager.fts_enabled
+            db_manager.fts_enabled = False
+            scanned = db_manager.search_conversations(term)
+            db_manager.fts_enabled = fts_enabled
+            assert _ids(indexed) == _ids(scanned), term
+
+        assert _ids(db_manager.search_conversations("%python%")) == [id1, id3]
+        assert db_manager.search_conversations("%closure%") == []
+
+
+def test_search_wildcards_and_short_terms():
+    """Patterns the index cannot answer still work through LIKE"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Python basics", "test-model", "Prompt", "Response")
+        id2 = db_manager.add_conversation("Go routines", "test-model", "Prompt", "Response")
+
+        assert _ids(db_manager.search_conversations("%go%")) == [id2]
+        assert _ids(db_manager.search_conversations("pyth%")) == [id1]
+        assert _ids(db_manager.search_conversations("%basics")) == [id1]
+
+        # ASCII patterns use SQLite's built-in LIKE rather than the Python function
+        with unittest.mock.patch('database._unicode_like', side_effect=AssertionError("unicode_like called")):
+            db_manager.close()  # Reconnect so the patched function is registered
+            assert _ids(db_manager.search_conversations("%GO%")) == [id2]
+            assert _ids(db_manager.search_conversations("PYTH%")) == [id1]
+        db_manager.close()
+
+
+def test_search_folds_non_ascii_case():
+    """Accented letters match regardless of case on both the indexed and the LIKE path"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Dire HÉLLO", "test-model", "Prompt", "Response")
+        id2 = db_manager.add_conversation("Café", "test-model", "Où est la gare ?", "ÉTÉ")
+        id3 = db_manager.add_conversation("Hello", "test-model", "Prompt", "Response")
+
+        for term in ["%héllo%", "%HÉLLO%", "%été%", "%CAFÉ%", "%OÙ%", "%é%", "%h_llo%", "café"]:
+            indexed = db_manager.search_conversations(term)
+            fts_enabled = db_manager.fts_enabled
+            db_manager.fts_enabled = False
+            scanned = db_manager.search_conversations(term)
+            db_manager.fts_enabled = fts_enabled
+            assert _ids(indexed) == _ids(scanned), term
+
+        assert _ids(db_manager.search_conversations("%héllo%")) == [id1]
+        assert _ids(db_manager.search_conversations("%É%")) == [id1, id2]
+        assert _ids(db_manager.search_conversations("%h_llo%")) == [id1, id3]
+        assert _ids(db_manager.search_conversations("CAFÉ")) == [id2]
+
+
+if __name__ == "__main__":
+    test_search_index_matches_like_search()
+    test_search_wildcards_and_short_terms()
+    test_search_folds_non_ascii_case()
+    print("Full-text search tests passed!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test that streamed LLM responses are buffered and written out in larger pieces
+"""
+
+import io
+import os
+import sys
+import unittest.mock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import utils
+import cli
+from cli import CLIHandler, _STREAM_FLUSH_CHARS, _STREAM_FLUSH_INTERVAL
+
+
+def test_stream_buffered_until_newline_or_end():
+    """Parts are held back until a newline, the size limit or the end-of-stream marker"""
+    out = io.StringIO()
+
+    # A stopped clock keeps the idle deadline out of the way
+    with unittest.mock.patch('sys.stdout', out), unittest.mock.patch.object(cli.time, 'monotonic', return_value=0.0):
+        cli_handler = CLIHandler(None, None, "test-model")
+        cli_handler._stream_response_callback("Hel")
+        cli_handler._stream_response_callback("lo")
+        assert out.getvalue() == ""
+
+        cli_handler._stream_response_callback(" world\n")
+        assert out.getvalue() == utils.RESPONSE_PREFIX + "Hello world\n" + utils.RESPONSE_SUFFIX
+
+        cli_handler._stream_response_callback("tail")
+        cli_handler._stream_response_callback("")
+
+    assert out.getvalue().endswith(utils.RESPONSE_PREFIX + "tail" + utils.RESPONSE_SUFFIX)
+
+
+def test_stream_flushed_at_size_limit():
+    """A long run without newlines is written once the buffer reaches the limit"""
+    out = io.StringIO()
+
+    with unittest.mock.patch('sys.stdout', out), unittest.mock.patch.object(cli.time, 'monotonic', return_value=0.0):
+        cli_handler = CLIHandler(None, None, "test-model")
+        for _ in range(_STREAM_FLUSH_CHARS):
+            cli_handler._stream_response_callback("x")
+
+    assert out.getvalue() == utils.RESPONSE_PREFIX + "x" * _STREAM_FLUSH_CHARS + utils.RESPONSE_SUFFIX
+
+
+def test_stream_flushed_after_idle_interval():
+    """Parts without newlines are written once the last write is older than the interval"""
+    out = io.StringIO()
+    clock = [100.0]
+
+    with unittest.mock.patch('sys.stdout', out), \
+            unittest.mock.patch.object(cli.time, 'monotonic', side_effect=lambda: clock[0]):
+        cli_handler = CLIHandler(None, None, "test-model")
+
+        cli_handler._stream_response_callback("Slow")
+        clock[0] += _STREAM_FLUSH_INTERVAL / 2
+        cli_handler._stream_response_callback(" model")
+        assert out.getvalue() == ""
+
+        clock[0] += _STREAM_FLUSH_INTERVAL / 2
+        cli_handler._stream_response_callback(" writes")
+        assert out.getvalue() == utils.RESPONSE_PREFIX + "Slow model writes" + utils.RESPONSE_SUFFIX
+
+        # The interval counts from the last write
+        clock[0] += _STREAM_FLUSH_INTERVAL / 2
+        cli_handler._stream_response_callback(" a long")
+        assert out.getvalue().count(utils.RESPONSE_PREFIX) == 1
+        clock[0] += _STREAM_FLUSH_INTERVAL
+        cli_handler._stream_response_callback(" paragraph")
+
+    assert out.getvalue().endswith(utils.RESPONSE_PREFIX + " a long paragraph" + utils.RESPONSE_SUFFIX)
+
+
+if __name__ == "__main__":
+    test_stream_buffered_until_newline_or_end()
+    test_stream_flushed_at_size_limit()
+    test_stream_flushed_after_idle_interval()
+    print("Stream output tests passed!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the queries that walk the conversation tree up and down
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from temp_db import temp_db_manager
+
+
+def _walk_tree(node, depth=0):
+    """Yield (node, depth) pairs of a get_conversation_tree result in pre-order."""
+    yield node, depth
+    for child in node['children']:
+        yield from _walk_tree(child, depth + 1)
+
+
+def test_is_descendant():
+    """is_descendant walks the whole subtree, not just direct children"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Root", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Child", "test-model", "Prompt 2", "Response 2", pid=id1)
+        id3 = db_manager.add_conversation("Grandchild", "test-model", "Prompt 3", "Response 3", pid=id2)
+        id4 = db_manager.add_conversation("Other", "test-model", "Prompt 4", "Response 4")
+
+        assert db_manager.is_descendant(id1, id2)
+        assert db_manager.is_descendant(id1, id3)
+        assert not db_manager.is_descendant(id3, id1)
+        assert not db_manager.is_descendant(id1, id1)
+        assert not db_manager.is_descendant(id1, id4)
+
+        # A parent cycle left behind in the data must not hang the ancestor walk
+        conn = db_manager._get_connection()
+        conn.execute('UPDATE conversations SET pid = ? WHERE id = ?', (id3, id1))
+        conn.commit()
+        assert db_manager.is_descendant(id1, id3)
+        assert not db_manager.is_descendant(id4, id1)
+
+
+def test_ancestor_ids():
+    """Ancestor lookups return the path from the root down to the conversation"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Root", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Child", "test-model", "Prompt 2", "Response 2", pid=id1)
+        id3 = db_manager.add_conversation("Grandchild", "test-model", "Prompt 3", "Response 3", pid=id2)
+
+        assert db_manager.get_ancestor_ids(id3) == [id1, id2, id3]
+        assert db_manager.get_ancestor_ids(id1) == [id1]
+        assert db_manager.get_ancestor_ids(999) == [999]
+
+        chain = db_manager.get_conversation_chain(id3)
+        assert [conversation.id for conversation in chain] == [id1, id2, id3]
+        assert chain[0].subject == "Root"
+        assert db_manager.get_conversation_chain(999) == []
+
+
+def test_conversation_tree_from_single_query():
+    """get_conversation_tree nests every descendant under the right parent"""
+    with temp_db_manager() as db_manager:
+        id1 = db_manager.add_conversation("Root", "test-model", "Prompt 1", "Response 1")
+        id2 = db_manager.add_conversation("Child A", "test-model", "Prompt 2", "Response 2", pid=id1)
+        id3 = db_manager.add_conversation("Child B", "test-model", "Prompt 3", "Response 3", pid=id1)
+        id4 = db_manager.add_conversation("Grandchild", "test-model", "Prompt 4", "Response 4", pid=id2)
+        db_manager.add_conversation("Unrelated", "test-model", "Prompt 5", "Response 5")
+
+        tree = db_manager.get_conversation_tree(id1)
+        assert tree['id'] == id1
+        assert [child['id'] for child in tree['children']] == [id2, id3]
+        assert [child['id'] for child in tree['children'][0]['children']] == [id4]
+        assert tree['children'][1]['children'] == []
+
+        assert db_manager.get_conversation_tree(999) is None
+
+
+def test_iter_subtree_matches_tree_walk():
+    """iter_subtree yields the same nodes and depths as walking get_conversation_tree"""
+    with temp_db_manager() as db_manager:
+        base = datetime(2024, 1, 1, 10, 0, 0)
+        root = db_manager.add_conversation("Root", "test-model", "Prompt", "Response", user_prompt_timestamp=base)
+        # Created out of timestamp order, with and without microseconds
+        late = db_manager.add_conversation("Late", "test-model", "Prompt", "Response", pid=root,
+                                           user_prompt_timestamp=base + timedelta(seconds=2))
+        early = db_manager.add_conversation("Early", "test-model", "Prompt", "Response", pid=root,
+                                            user_prompt_timestamp=base + timedelta(seconds=1, microseconds=500000))
+        db_manager.add_conversation("Early child", "test-model", "Prompt", None, pid=early,
+                                    user_prompt_timestamp=base + timedelta(seconds=3))
+        db_manager.add_conversation("Late child", "test-model", "Prompt", "Response", pid=late,
+                                    user_prompt_timestamp=base + timedelta(seconds=1))
+        db_manager.add_conversation("Tied", "test-model", "Prompt", "Response", pid=root,
+                                    user_prompt_timestamp=base + timedelta(seconds=2))
+
+        expected = [(node['id'], depth) for node, depth in _walk_tree(db_manager.get_conversation_tree(root))]
+        streamed = [(row.id, depth) for row, depth in db_manager.iter_subtree(root)]
+        assert streamed == expected
+        assert [row.subject for row, _ in db_manager.iter_subtree(early)] == ["Early", "Early child"]
+        assert list(db_manager.iter_subtree(999)) == []
+
+
+if __name__ == "__main__":
+    test_is_descendant()
+    test_ancestor_ids()
+    test_conversation_tree_from_single_query()
+    test_iter_subtree_matches_tree_walk()
+    print("Tree query tests passed!")
@@ -142,6 +142,7 @@ def test_unlink_functionality():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
@@ -42,11 +42,11 @@ def test_open_command_with_updated_parent_format():
         conversation_tree = ConversationTree(db_manager, ollama_client)
         
         # Create a parent conversation
-        parent_id = conversation_tree.create_conversation("This is the parent prompt", None, None)
+        parent_id, _ = conversation_tree.create_conversation("This is the parent prompt", None, None)
         print(f"Created parent conversation with ID: {parent_id}")
         
         # Create a child conversation
-        child_id = conversation_tree.create_conversation("This is the child prompt", parent_id, None)
+        child_id, _ = conversation_tree.create_conversation("This is the child prompt", parent_id, None)
         print(f"Created child conversation with ID: {child_id}")
         
         # Create CLI handler
@@ -88,6 +88,7 @@ def test_open_command_with_updated_parent_format():
             
     finally:
         # Clean up the temporary database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
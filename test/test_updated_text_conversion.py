@@ -70,6 +70,7 @@ def test_updated_text_conversion():
         
     finally:
         # Clean up the temp database
+        db_manager.close()
         if os.path.exists(temp_db_path):
             os.remove(temp_db_path)
 
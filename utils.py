@@ -1,15 +1,36 @@
 # Utility functions for the Promptree CLI application
 import sys
 import os
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from database import Conversation
+
+# Field lines in the plain text edit files, compiled once at import
+_SUBJECT_LINE_RE = re.compile(r'^SUBJECT:\s*(.*)', re.MULTILINE)
+_PARENT_ID_LINE_RE = re.compile(r'^PARENT_ID:\s*(.*)', re.MULTILINE)
+_LINKED_IDS_LINE_RE = re.compile(r'^LINKED_CONVERSATIONS_ID:\s*(.*)', re.MULTILINE)
+
+# Marker-delimited prompt block in the ask input file
+_USER_PROMPT_BLOCK_RE = re.compile(r'USER_PROMPT_START\s*\n(.*?)\n\s*USER_PROMPT_END', re.DOTALL)
 
 # Initialize colorama for cross-platform colored output
 try:
     from colorama import init, Fore, Style
     init()  # Initialize colorama
     
+    # ANSI codes wrapped around streamed response text
+    RESPONSE_PREFIX = Fore.GREEN
+    RESPONSE_SUFFIX = Style.RESET_ALL
+    
+    # ANSI codes wrapped around subjects, for loops that format many lines
+    SUBJECT_PREFIX = Fore.YELLOW
+    SUBJECT_SUFFIX = Style.RESET_ALL
+    
     def format_subject(subject: str) -> str:
         """Format subject text with yellow color."""
-        return f"{Fore.YELLOW}{subject}{Style.RESET_ALL}"
+        return f"{SUBJECT_PREFIX}{subject}{SUBJECT_SUFFIX}"
 
     def format_prompt(prompt: str) -> str:
         """Format prompt text with cyan color."""
@@ -17,7 +38,7 @@ try:
 
     def format_response(response: str) -> str:
         """Format response text with green color."""
-        return f"{Fore.GREEN}{response}{Style.RESET_ALL}"
+        return f"{RESPONSE_PREFIX}{response}{RESPONSE_SUFFIX}"
 
     def format_error(error: str) -> str:
         """Format error text with red color."""
@@ -25,6 +46,11 @@ try:
 
 except ImportError:
     # If colorama is not available, provide simple fallback functions
+    RESPONSE_PREFIX = ""
+    RESPONSE_SUFFIX = ""
+    SUBJECT_PREFIX = ""
+    SUBJECT_SUFFIX = ""
+    
     def format_subject(subject: str) -> str:
         """Format subject text (no color without colorama)."""
         return subject
@@ -42,12 +68,14 @@ except ImportError:
         return error
 
 
-def conversation_to_text(conversation: tuple, db_manager=None) -> str:
-    """Convert a conversation tuple to a plain text format for editing.
+def conversation_to_text(conversation: 'Conversation', db_manager=None, linked_ids: list = None) -> str:
+    """Convert a conversation row to a plain text format for editing.
     
     Args:
-        conversation: A tuple representing a conversation from the database
+        conversation: A conversation row from the database
         db_manager: Database manager to fetch linked conversations
+        linked_ids: Linked conversation IDs already known to the caller; when given,
+            the database is not queried for them
         
     Returns:
         Plain text format of the conversation with only editable fields
@@ -55,14 +83,9 @@ def conversation_to_text(conversation: tuple, db_manager=None) -> str:
     if not conversation:
         return ""
     
-    # Extract conversation data from tuple
-    # (id, subject, model_name, user_prompt, llm_response, pid, user_prompt_timestamp, llm_response_timestamp)
-    conv_id, subject, model_name, user_prompt, llm_response, pid, user_prompt_timestamp, llm_response_timestamp = conversation
-    
-    # Get linked conversation IDs if db_manager is provided
-    linked_ids = []
-    if db_manager:
-        linked_ids = db_manager.get_conversation_link_ids(conv_id)
+    # Get linked conversation IDs if the caller did not supply them
+    if linked_ids is None:
+        linked_ids = db_manager.get_conversation_link_ids(conversation.id) if db_manager else []
     
     # Create a plain text format that's easy to edit
     text_content = f"""# Conversation Edit File
@@ -72,16 +95,16 @@ def conversation_to_text(conversation: tuple, db_manager=None) -> str:
 # USER PROMPT section starts after 'USER_PROMPT_START' and ends before 'USER_PROMPT_END'
 # LLM RESPONSE section starts after 'LLM_RESPONSE_START' and ends before 'LLM_RESPONSE_END'
 
-SUBJECT: {subject}
-PARENT_ID: {pid if pid is not None else ''}
+SUBJECT: {conversation.subject}
+PARENT_ID: {conversation.pid if conversation.pid is not None else ''}
 LINKED_CONVERSATIONS_ID: {','.join(map(str, linked_ids)) if linked_ids else ''}
 
 USER_PROMPT_START
-{user_prompt}
+{conversation.user_prompt}
 USER_PROMPT_END
 
 LLM_RESPONSE_START
-{llm_response if llm_response else ''}
+{conversation.llm_response if conversation.llm_response else ''}
 LLM_RESPONSE_END
 ---
 """
@@ -98,8 +121,6 @@ def parse_conversation_text(text_content: str) -> dict:
     Returns:
         Dictionary with updated conversation fields
     """
-    import re
-    
     # Initialize with default values (only editable fields)
     updated_data = {
         'subject': '',
@@ -144,14 +165,14 @@ def parse_conversation_text(text_content: str) -> dict:
     
     # Extract only editable fields using regex
     # SUBJECT
-    subject_match = re.search(r'^SUBJECT:\s*(.*)', text_content, re.MULTILINE)
+    subject_match = _SUBJECT_LINE_RE.search(text_content)
     if subject_match:
         updated_data['subject'] = subject_match.group(1).strip()
     
     # Note: MODEL_NAME is in the text file but should not be editable - so we don't parse it
     
     # PARENT_ID
-    parent_id_match = re.search(r'^PARENT_ID:\s*(.*)', text_content, re.MULTILINE)
+    parent_id_match = _PARENT_ID_LINE_RE.search(text_content)
     if parent_id_match:
         parent_id_str = parent_id_match.group(1).strip()
         if parent_id_str.lower() in ('', 'none', 'null'):
@@ -163,7 +184,7 @@ def parse_conversation_text(text_content: str) -> dict:
                 updated_data['pid'] = None  # Invalid parent ID, set to None
     
     # LINKED_CONVERSATIONS_ID
-    linked_ids_match = re.search(r'^LINKED_CONVERSATIONS_ID:\s*(.*)', text_content, re.MULTILINE)
+    linked_ids_match = _LINKED_IDS_LINE_RE.search(text_content)
     if linked_ids_match:
         linked_ids_str = linked_ids_match.group(1).strip()
         if linked_ids_str:
@@ -182,8 +203,6 @@ def parse_ask_file_content(text_content: str):
     """
     Parse the content from the ask command text file.
     """
-    import re
-    
     # Initialize with default values
     parsed_data = {
         'parent_id': None,
@@ -191,12 +210,12 @@ def parse_ask_file_content(text_content: str):
     }
     
     # Extract user prompt between markers
-    user_prompt_match = re.search(r'USER_PROMPT_START\s*\n(.*?)\n\s*USER_PROMPT_END', text_content, re.DOTALL)
+    user_prompt_match = _USER_PROMPT_BLOCK_RE.search(text_content)
     if user_prompt_match:
         parsed_data['user_prompt'] = user_prompt_match.group(1).strip()
     
     # Extract parent ID
-    parent_id_match = re.search(r'^PARENT_ID:\s*(.*)', text_content, re.MULTILINE)
+    parent_id_match = _PARENT_ID_LINE_RE.search(text_content)
     if parent_id_match:
         parent_id_str = parent_id_match.group(1).strip()
         if parent_id_str.lower() in ('', 'none', 'null'):
@@ -213,9 +232,11 @@ def parse_ask_file_content(text_content: str):
 def parse_add_file_content(text_content: str):
     """
     Parse the content from the add command text file.
-    """
-    import re
     
+    The file is read in a single pass over its lines: the first PARENT_ID and
+    LINKED_CONVERSATIONS_ID lines outside the prompt and response blocks are the
+    fields, and the first complete block of each kind is its text.
+    """
     # Initialize with default values
     parsed_data = {
         'parent_id': None,
@@ -224,20 +245,34 @@ def parse_add_file_content(text_content: str):
         'linked_ids': []
     }
     
-    # Extract user prompt between markers
-    user_prompt_match = re.search(r'USER_PROMPT_START\s*\n(.*?)\n\s*USER_PROMPT_END', text_content, re.DOTALL)
-    if user_prompt_match:
-        parsed_data['user_prompt'] = user_prompt_match.group(1).strip()
+    parent_id_str = None
+    linked_ids_str = None
+    blocks = {}
+    block_lines = None  # Lines of the block being read, None outside a block
+    block_end = block_key = None
     
-    # Extract LLM response between markers
-    llm_response_match = re.search(r'LLM_RESPONSE_START\s*\n(.*?)\n\s*LLM_RESPONSE_END', text_content, re.DOTALL)
-    if llm_response_match:
-        parsed_data['llm_response'] = llm_response_match.group(1).strip()
+    # Split on '\n' only: splitlines() would also break the text on characters
+    # such as form feeds that belong to the prompt or response
+    for line in text_content.split('\n'):
+        marker = line.strip()
+        if block_lines is not None:
+            if marker == block_end:
+                blocks.setdefault(block_key, '\n'.join(block_lines).strip())
+                block_lines = None
+            else:
+                block_lines.append(line)
+        elif marker == 'USER_PROMPT_START':
+            block_lines, block_end, block_key = [], 'USER_PROMPT_END', 'user_prompt'
+        elif marker == 'LLM_RESPONSE_START':
+            block_lines, block_end, block_key = [], 'LLM_RESPONSE_END', 'llm_response'
+        elif parent_id_str is None and line.startswith('PARENT_ID:'):
+            parent_id_str = line[len('PARENT_ID:'):].strip()
+        elif linked_ids_str is None and line.startswith('LINKED_CONVERSATIONS_ID:'):
+            linked_ids_str = line[len('LINKED_CONVERSATIONS_ID:'):].strip()
+    parsed_data.update(blocks)
     
-    # Extract parent ID
-    parent_id_match = re.search(r'^PARENT_ID:\s*(.*)', text_content, re.MULTILINE)
-    if parent_id_match:
-        parent_id_str = parent_id_match.group(1).strip()
+    # Interpret the parent ID
+    if parent_id_str is not None:
         if parent_id_str.lower() in ('', 'none', 'null'):
             parsed_data['parent_id'] = None
         else:
@@ -246,10 +281,8 @@ def parse_add_file_content(text_content: str):
             except ValueError:
                 parsed_data['parent_id'] = None  # Invalid parent ID, set to None
     
-    # Extract linked conversations ID
-    linked_ids_match = re.search(r'^LINKED_CONVERSATIONS_ID:\s*(.*)', text_content, re.MULTILINE)
-    if linked_ids_match:
-        linked_ids_str = linked_ids_match.group(1).strip()
+    # Interpret the linked conversations ID
+    if linked_ids_str is not None:
         if linked_ids_str:
             try:
                 # Parse comma-separated IDs